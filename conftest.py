@@ -0,0 +1,3 @@
+"""
+Makes the src package importable when running plain `pytest` from the project root
+"""
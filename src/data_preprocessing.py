@@ -5,53 +5,247 @@ Data Preprocessing Module
 import pandas as pd
 import numpy as np
 from sklearn.preprocessing import StandardScaler
+import glob
+import hashlib
+import time
 import os
 
+from src.feature_pipeline import SchemaEncoder, FeaturePipeline, SENSOR_COLUMNS, TYPE_CATEGORIES
+
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
+# Training column layout (Type H is the baseline)
+ENCODER = SchemaEncoder()
+
+DATA_PATH = os.path.join(PROJECT_ROOT, 'data', 'ai4i2020.csv')
+
+# Parsed copies of the CSV, keyed by source path, size and mtime
+DATA_CACHE_DIR = os.path.join(PROJECT_ROOT, '.cache', 'data')
+
+FAILURE_COLUMNS = ['Machine failure', 'TWF', 'HDF', 'PWF', 'OSF', 'RNF']
+
+# Explicit dtypes for the ai4i2020.csv schema (columns not in the file are ignored)
+DATASET_DTYPES = {
+    'UDI': 'int32',
+    'Type': pd.CategoricalDtype(TYPE_CATEGORIES),
+    **{column: 'float32' for column in SENSOR_COLUMNS},
+    **{column: 'int8' for column in FAILURE_COLUMNS}
+}
+
+
+def _has_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
 
-def load_data(file_path=None):
+def _cache_prefix(file_path):
+    # Hash of the resolved path keeps same-named CSVs in different directories apart
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    digest = hashlib.sha1(os.path.realpath(file_path).encode()).hexdigest()[:12]
+    return f'{name}-{digest}'
+
+
+def _cache_path(file_path, cache_dir):
+    stat = os.stat(file_path)
+    return os.path.join(cache_dir, f'{_cache_prefix(file_path)}-{stat.st_size}-{stat.st_mtime_ns}.parquet')
+
+
+def read_typed_csv(file_path=None, engine=None):
+    """
+    Parse a dataset CSV with explicit dtypes
+    
+    Parameters:
+    -----------
+    file_path : str
+        Path to CSV file (same schema as ai4i2020.csv)
+    engine : str (optional)
+        'pyarrow' or 'c' (default: pyarrow when installed)
+        
+    Returns:
+    --------
+    DataFrame: float32 sensors, categorical Type, int8 failure flags
+    """
+    if file_path is None:
+        file_path = DATA_PATH
+    if engine is None:
+        engine = 'pyarrow' if _has_pyarrow() else 'c'
+    
+    return pd.read_csv(file_path, dtype=DATASET_DTYPES, engine=engine)
+
+
+def load_data(file_path=None, typed=True, engine=None, use_cache=True, cache_dir=DATA_CACHE_DIR):
     """
     Load dataset
     
+    With typed=True the CSV is parsed once with explicit dtypes and saved
+    as Parquet; later calls read the Parquet copy while the source file
+    keeps the same size and mtime.
+    
     Parameters:
     -----------
     file_path : str
         Path to CSV file
+    typed : bool
+        Explicit compact dtypes (see DATASET_DTYPES); False gives the
+        plain pd.read_csv result
+    engine : str (optional)
+        CSV parser for typed loads ('pyarrow' or 'c')
+    use_cache : bool
+        Read/write the Parquet cache (needs pyarrow)
+    cache_dir : str
+        Cache directory
         
     Returns:
     --------
     DataFrame: Loaded data
     """
     if file_path is None:
-        file_path = os.path.join(PROJECT_ROOT, 'data', 'ai4i2020.csv')
+        file_path = DATA_PATH
+    
+    if not typed:
+        return pd.read_csv(file_path)
+    
+    if not (use_cache and _has_pyarrow()):
+        return read_typed_csv(file_path, engine)
+    
+    cache_path = _cache_path(file_path, cache_dir)
+    if os.path.exists(cache_path):
+        return pd.read_parquet(cache_path)
     
-    df = pd.read_csv(file_path)
+    df = read_typed_csv(file_path, engine)
+    os.makedirs(cache_dir, exist_ok=True)
+    
+    # Drop copies of older versions of the same file
+    prefix = glob.escape(_cache_prefix(file_path))
+    for stale in glob.glob(os.path.join(cache_dir, f'{prefix}-*-*.parquet')):
+        os.remove(stale)
+    
+    # Write then rename, so a concurrent reader never sees a partial file
+    tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, cache_path)
     return df
 
 
-def prepare_features(df):
+def benchmark_load(file_path=None, repeats=5):
     """
-    Prepare features for modeling
+    Time the plain, typed and cached loads of a dataset CSV
+    
+    Returns:
+    --------
+    dict: Best-of-repeats seconds and DataFrame memory per load mode
+    """
+    import tempfile
+    
+    if file_path is None:
+        file_path = DATA_PATH
+    
+    def _best(fn):
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            df = fn()
+            timings.append(time.perf_counter() - start)
+        return {'seconds': min(timings), 'memory_mb': df.memory_usage(deep=True).sum() / 1e6}
+    
+    results = {
+        'plain_csv': _best(lambda: load_data(file_path, typed=False)),
+        'typed_csv_c': _best(lambda: read_typed_csv(file_path, engine='c'))
+    }
+    if _has_pyarrow():
+        results['typed_csv_pyarrow'] = _best(lambda: read_typed_csv(file_path, engine='pyarrow'))
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cold = []
+            for _ in range(repeats):
+                for path in glob.glob(os.path.join(cache_dir, '*')):
+                    os.remove(path)
+                start = time.perf_counter()
+                load_data(file_path, cache_dir=cache_dir)
+                cold.append(time.perf_counter() - start)
+            results['cache_cold'] = {'seconds': min(cold), 'memory_mb': results['typed_csv_pyarrow']['memory_mb']}
+            results['cache_warm'] = _best(lambda: load_data(file_path, cache_dir=cache_dir))
+    return results
+
+
+def iter_data_chunks(file_path=None, chunksize=100_000):
+    """
+    Read a dataset CSV in fixed-size chunks
+    
+    Parameters:
+    -----------
+    file_path : str
+        Path to CSV file (same schema as ai4i2020.csv)
+    chunksize : int
+        Rows per chunk
+        
+    Yields:
+    -------
+    DataFrame: Next chunk of rows
+    """
+    if file_path is None:
+        file_path = DATA_PATH
+    
+    with pd.read_csv(file_path, chunksize=chunksize) as reader:
+        for chunk in reader:
+            yield chunk
+
+
+def encode_equipment_type(df):
+    """
+    Map the Type column to the Type_L / Type_M indicator columns
+    
+    Unlike pd.get_dummies this always emits both columns, whatever
+    Type values the chunk happens to contain.
     
     Parameters:
     -----------
     df : DataFrame
-        Raw dataframe
+        Data with a Type column (L, M or H)
         
     Returns:
     --------
-    X, y: Features and target
+    DataFrame: Copy with Type_L and Type_M added
     """
-    # Drop unnecessary columns
-    df_model = df.drop(columns=['UDI', 'Product ID', 'TWF', 'HDF', 'PWF', 'OSF', 'RNF'], errors='ignore')
+    df = df.copy()
+    for column, values in zip(ENCODER.type_columns, ENCODER.type_indicators(df)):
+        df[column] = values.astype(np.int8)
+    return df
+
+
+def prepare_features(df, engineer=False, out=None, as_frame=True):
+    """
+    Prepare features for modeling
     
-    # One-hot encoding
-    df_model = pd.get_dummies(df_model, columns=['Type'], drop_first=True)
+    Uses the schema-locked training layout, so a chunk or a single row
+    that contains only one Type value still gets every Type column.
+    
+    Parameters:
+    -----------
+    df : DataFrame or dict
+        Raw rows (a dict of scalars is one row)
+    engineer : bool
+        Add the Temp_Diff / Power / Torque_Tool_Interaction columns
+        the model is trained on
+    out : ndarray (optional)
+        Preallocated (n_rows, n_columns) array to fill
+    as_frame : bool
+        Return X as a DataFrame; False returns the array itself
+        
+    Returns:
+    --------
+    X, y: Features and target (y is None without a Machine failure column)
+    """
+    X = ENCODER.transform(df, out=out, engineer=engineer)
+    y = np.atleast_1d(np.asarray(df['Machine failure'])) if 'Machine failure' in df else None
     
-    # Separate features and target
-    X = df_model.drop('Machine failure', axis=1, errors='ignore')
-    y = df_model['Machine failure'] if 'Machine failure' in df_model.columns else None
+    if as_frame:
+        index = df.index if isinstance(df, pd.DataFrame) else None
+        X = pd.DataFrame(X, columns=ENCODER.feature_columns(engineer), index=index, copy=False)
+        if y is not None:
+            y = pd.Series(y, index=index, name='Machine failure')
     
     return X, y
 
@@ -60,6 +254,9 @@ def scale_features(X_train, X_test=None):
     """
     Scale features using StandardScaler
     
+    Needs the whole matrix in memory; see scale_features_out_of_core
+    for data that does not fit.
+    
     Parameters:
     -----------
     X_train : DataFrame
@@ -81,6 +278,126 @@ def scale_features(X_train, X_test=None):
     return X_train_scaled, scaler
 
 
+def fit_scaler_out_of_core(file_path=None, chunksize=100_000, engineer=True):
+    """
+    Fit a StandardScaler chunk by chunk with partial_fit
+    
+    Only one chunk is held in memory at a time.
+    
+    Parameters:
+    -----------
+    file_path : str
+        Path to CSV file (same schema as ai4i2020.csv)
+    chunksize : int
+        Rows per chunk
+    engineer : bool
+        Include the interaction columns (the model input layout)
+        
+    Returns:
+    --------
+    StandardScaler, int: Fitted scaler and number of rows seen
+    """
+    columns = ENCODER.feature_columns(engineer)
+    scaler = StandardScaler()
+    n_rows = 0
+    
+    for chunk in iter_data_chunks(file_path, chunksize):
+        if len(chunk) == 0:
+            continue
+        X = ENCODER.transform(chunk, engineer=engineer)
+        scaler.partial_fit(pd.DataFrame(X, columns=columns, copy=False))
+        n_rows += len(chunk)
+    
+    return scaler, n_rows
+
+
+def scale_features_out_of_core(file_path=None, output_path=None, chunksize=100_000,
+                               scaler=None, dtype=np.float64):
+    """
+    Scale a dataset larger than memory into a memory-mapped .npy file
+    
+    Pass 1 fits the scaler with partial_fit (unless one is given); pass 2
+    writes every chunk's scaled model input straight into its rows of
+    the output file.
+    
+    Parameters:
+    -----------
+    file_path : str
+        Path to CSV file (same schema as ai4i2020.csv)
+    output_path : str (optional)
+        Output .npy file (default: .cache/data/<name>-scaled.npy)
+    chunksize : int
+        Rows per chunk
+    scaler : StandardScaler (optional)
+        Already fitted scaler over FEATURE_COLUMNS
+    dtype : numpy dtype
+        Output dtype (float32 halves the file)
+        
+    Returns:
+    --------
+    X, y, scaler: Scaled features (np.memmap), target (int8, or None) and scaler
+    """
+    if file_path is None:
+        file_path = DATA_PATH
+    if output_path is None:
+        name = os.path.splitext(os.path.basename(file_path))[0]
+        output_path = os.path.join(DATA_CACHE_DIR, f'{name}-scaled.npy')
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    
+    if scaler is None:
+        scaler, n_rows = fit_scaler_out_of_core(file_path, chunksize)
+    else:
+        n_rows = sum(len(chunk) for chunk in iter_data_chunks(file_path, chunksize))
+    pipeline = FeaturePipeline(scaler)
+    
+    X = np.lib.format.open_memmap(output_path, mode='w+', dtype=dtype,
+                                  shape=(n_rows, pipeline.n_features))
+    y = None
+    start = 0
+    for chunk in iter_data_chunks(file_path, chunksize):
+        end = start + len(chunk)
+        pipeline.transform(chunk, out=X[start:end])
+        if 'Machine failure' in chunk:
+            if y is None:
+                y = np.empty(n_rows, dtype=np.int8)
+            y[start:end] = chunk['Machine failure'].to_numpy()
+        start = end
+    X.flush()
+    
+    return X, y, scaler
+
+
+def check_out_of_core_scaling(file_path=None, chunksize=1000, atol=1e-9, output_path=None):
+    """
+    Compare out-of-core scaling with the in-memory StandardScaler
+    
+    Returns:
+    --------
+    dict: Max absolute differences (mean, variance, scaled matrix) and pass flag
+    """
+    import tempfile
+    
+    df = load_data(file_path, typed=False)
+    expected = FeaturePipeline().fit(df)
+    X_expected = expected.transform(df)
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        X, _, scaler = scale_features_out_of_core(
+            file_path, output_path or os.path.join(tmp_dir, 'scaled.npy'), chunksize
+        )
+        result = {
+            'rows': len(X),
+            'mean_max_abs_diff': float(np.max(np.abs(scaler.mean_ - expected.scaler.mean_))),
+            'var_max_rel_diff': float(np.max(np.abs(scaler.var_ / expected.scaler.var_ - 1))),
+            'matrix_max_abs_diff': float(np.max(np.abs(np.asarray(X) - X_expected)))
+        }
+        del X
+    
+    result['passed'] = max(result['mean_max_abs_diff'], result['var_max_rel_diff'],
+                           result['matrix_max_abs_diff']) <= atol
+    return result
+
+
 def get_equipment_features(equipment_type='M', air_temp=300, process_temp=310, 
                           rpm=1500, torque=40, tool_wear=180):
     """
@@ -90,17 +407,13 @@ def get_equipment_features(equipment_type='M', air_temp=300, process_temp=310,
     --------
     dict: Equipment features
     """
-    type_l = 1 if equipment_type == 'L' else 0
-    type_m = 1 if equipment_type == 'M' else 0
-    
     return {
         'Air temperature [K]': air_temp,
         'Process temperature [K]': process_temp,
         'Rotational speed [rpm]': rpm,
         'Torque [Nm]': torque,
         'Tool wear [min]': tool_wear,
-        'Type_L': type_l,
-        'Type_M': type_m
+        **ENCODER.encode_type(equipment_type)
     }
 
 
@@ -114,3 +427,9 @@ if __name__ == "__main__":
     X, y = prepare_features(df)
     print(f"\nFeatures shape: {X.shape}")
     print(f"Target distribution:\n{y.value_counts()}")
+    
+    print(f"\nOut-of-core scaling vs in-memory: {check_out_of_core_scaling()}")
+    
+    print(f"\nLoad benchmark:")
+    for mode, timing in benchmark_load().items():
+        print(f"  {mode:>18}: {timing['seconds'] * 1000:7.1f} ms, {timing['memory_mb']:.2f} MB")
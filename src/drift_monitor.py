@@ -0,0 +1,276 @@
+"""
+Input Drift Monitor Module
+"""
+
+import numpy as np
+import pandas as pd
+import threading
+
+from src.model_manager import DRIFT_REFERENCE_PATH
+
+DEFAULT_BINS = 20
+
+# Common PSI rule of thumb: < 0.1 stable, 0.1-0.25 moderate, > 0.25 drifted
+PSI_WARNING = 0.1
+PSI_DRIFT = 0.25
+
+# Floor for empty bins so PSI stays finite
+_EPSILON = 1e-4
+
+
+class DriftReference:
+    """
+    Binned training distribution of every model input feature
+
+    Bin edges are training quantiles, so each feature gets up to
+    n_bins equally populated bins (fewer for discrete features such as
+    the Type indicators).
+
+    Parameters:
+    -----------
+    feature_names : list of str
+        Feature order of the monitored matrix
+    edges : list of ndarray
+        Interior bin edges per feature (k edges -> k + 1 bins)
+    counts : list of ndarray
+        Training rows per bin
+    """
+
+    def __init__(self, feature_names, edges, counts):
+        self.feature_names = list(feature_names)
+        self.edges = [np.asarray(e, dtype=np.float64) for e in edges]
+        self.counts = [np.asarray(c, dtype=np.int64) for c in counts]
+        self.n_rows = int(self.counts[0].sum()) if self.counts else 0
+
+        # Flat bin layout shared by all sketches of this reference
+        sizes = [len(e) + 1 for e in self.edges]
+        self.offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.int64)
+        self.n_bins_total = int(sum(sizes))
+
+    @property
+    def proportions(self):
+        return [c / max(c.sum(), 1) for c in self.counts]
+
+    def bin_index(self, X):
+        """
+        Flat bin index of every value of a feature matrix (n_rows, n_features)
+        """
+        X = np.asarray(X)
+        index = np.empty(X.shape, dtype=np.int64)
+        for j, edges in enumerate(self.edges):
+            index[:, j] = np.searchsorted(edges, X[:, j], side='right')
+        index += self.offsets
+        return index
+
+    @classmethod
+    def from_matrix(cls, X, feature_names, n_bins=DEFAULT_BINS):
+        """
+        Build the reference from a training feature matrix
+
+        Parameters:
+        -----------
+        X : ndarray (n_rows, n_features)
+            Model input the predictor was trained on
+        feature_names : list of str
+            Column names of X
+        n_bins : int
+            Maximum bins per feature
+
+        Returns:
+        --------
+        DriftReference: Reference with training counts filled in
+        """
+        X = np.asarray(X, dtype=np.float64)
+        quantiles = np.linspace(0, 1, n_bins + 1)[1:-1]
+        edges = [np.unique(np.quantile(X[:, j], quantiles)) for j in range(X.shape[1])]
+
+        reference = cls(feature_names, edges, [np.zeros(len(e) + 1) for e in edges])
+        counts = np.bincount(reference.bin_index(X).ravel(), minlength=reference.n_bins_total)
+        return cls(feature_names, edges, np.split(counts, reference.offsets[1:]))
+
+    def save(self, path=DRIFT_REFERENCE_PATH):
+        arrays = {}
+        for j, (edges, counts) in enumerate(zip(self.edges, self.counts)):
+            arrays[f'edges_{j}'] = edges
+            arrays[f'counts_{j}'] = counts
+        np.savez(path, feature_names=np.array(self.feature_names, dtype=str), **arrays)
+
+    @classmethod
+    def load(cls, path=DRIFT_REFERENCE_PATH):
+        with np.load(path, allow_pickle=False) as arrays:
+            feature_names = arrays['feature_names'].tolist()
+            edges = [arrays[f'edges_{j}'] for j in range(len(feature_names))]
+            counts = [arrays[f'counts_{j}'] for j in range(len(feature_names))]
+        return cls(feature_names, edges, counts)
+
+
+class DriftMonitor:
+    """
+    Fixed-memory streaming histograms of live model inputs
+
+    Each update bins a whole batch (one searchsorted per feature and one
+    bincount), so the cost per scored batch is small next to the model
+    call. Memory is one int64 counter per reference bin, whatever the
+    number of rows seen. Monitors over the same reference merge by adding
+    their counters, so parallel workers can each keep one.
+
+    Parameters:
+    -----------
+    reference : DriftReference
+        Training distribution to compare against
+    """
+
+    def __init__(self, reference):
+        self.reference = reference
+        self.counts = np.zeros(reference.n_bins_total, dtype=np.int64)
+        self.n_rows = 0
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def update(self, X):
+        """
+        Add a batch of model input rows (n_rows, n_features)
+        """
+        X = np.asarray(X)
+        if X.ndim == 1:
+            X = X[None, :]
+        if len(X) == 0:
+            return
+        counts = np.bincount(self.reference.bin_index(X).ravel(), minlength=len(self.counts))
+        with self._lock:
+            self.counts += counts
+            self.n_rows += len(X)
+
+    def merge(self, other):
+        """
+        Add the counts of another monitor over the same reference
+        """
+        if other.reference.n_bins_total != self.reference.n_bins_total:
+            raise ValueError("Cannot merge drift monitors built on different references")
+        with self._lock:
+            self.counts += other.counts
+            self.n_rows += other.n_rows
+        return self
+
+    def drain(self):
+        """
+        Copy of the current counts, then reset this monitor
+
+        Returns:
+        --------
+        DriftMonitor: Counts accumulated since the last drain
+        """
+        sketch = DriftMonitor(self.reference)
+        with self._lock:
+            sketch.counts, self.counts = self.counts, sketch.counts
+            sketch.n_rows, self.n_rows = self.n_rows, 0
+        return sketch
+
+    def reset(self):
+        with self._lock:
+            self.counts[:] = 0
+            self.n_rows = 0
+
+    def scores(self):
+        """
+        PSI and KS distance of every feature against the reference
+
+        KS is computed on the binned CDFs, so it is a lower bound of the
+        exact two-sample statistic.
+
+        Returns:
+        --------
+        DataFrame: feature, psi, ks and status ('OK', 'Warning', 'Drift')
+        """
+        with self._lock:
+            live_counts = np.split(self.counts.copy(), self.reference.offsets[1:])
+
+        rows = []
+        for name, expected, observed in zip(self.reference.feature_names,
+                                            self.reference.proportions, live_counts):
+            actual = observed / max(observed.sum(), 1)
+            p = np.maximum(expected, _EPSILON)
+            q = np.maximum(actual, _EPSILON)
+            psi = float(np.sum((q - p) * np.log(q / p)))
+            ks = float(np.max(np.abs(np.cumsum(actual) - np.cumsum(expected))))
+            rows.append({'feature': name, 'psi': psi, 'ks': ks})
+
+        report = pd.DataFrame(rows, columns=['feature', 'psi', 'ks'])
+        report['status'] = np.select(
+            [report['psi'] > PSI_DRIFT, report['psi'] > PSI_WARNING], ['Drift', 'Warning'], 'OK'
+        )
+        if self.n_rows == 0:
+            report['status'] = 'No data'
+        return report
+
+
+def build_reference(data=None, n_bins=DEFAULT_BINS, path=DRIFT_REFERENCE_PATH):
+    """
+    Build and save the drift reference from the training data
+
+    Parameters:
+    -----------
+    data : DataFrame (optional)
+        Training rows (default: data/ai4i2020.csv)
+    n_bins : int
+        Maximum bins per feature
+    path : str (optional)
+        Output .npz file (None to skip saving)
+
+    Returns:
+    --------
+    DriftReference: The reference
+    """
+    from src.model_manager import get_model_manager
+    from src.data_preprocessing import load_data
+
+    pipeline = get_model_manager().pipeline
+    if data is None:
+        data = load_data()
+    reference = DriftReference.from_matrix(pipeline.transform(data), pipeline.feature_columns, n_bins)
+    if path is not None:
+        reference.save(path)
+    return reference
+
+
+if __name__ == "__main__":
+    import time
+    from src.model_manager import get_model_manager
+    from src.data_preprocessing import load_data
+
+    df = load_data()
+    reference = build_reference(df)
+    print(f"✅ Drift reference saved to: {DRIFT_REFERENCE_PATH}")
+
+    pipeline = get_model_manager().pipeline
+    X = pipeline.transform(df)
+
+    # Two workers on halves of the data, merged: matches the training distribution
+    halves = np.array_split(X, 2)
+    monitor = DriftMonitor(reference)
+    for half in halves:
+        worker = DriftMonitor(reference)
+        worker.update(half)
+        monitor.merge(worker)
+    print("\nTraining data vs reference:")
+    print(monitor.scores().to_string(index=False))
+
+    # Hotter machines with more worn tools
+    shifted = df.copy()
+    shifted['Process temperature [K]'] += 2.0
+    shifted['Tool wear [min]'] *= 1.3
+    X_shifted = pipeline.transform(shifted)
+    monitor = DriftMonitor(reference)
+    start = time.perf_counter()
+    monitor.update(X_shifted)
+    elapsed = time.perf_counter() - start
+    print(f"\nShifted data vs reference ({len(shifted) / elapsed:,.0f} rows/sec):")
+    print(monitor.scores().to_string(index=False))
@@ -0,0 +1,363 @@
+"""
+Feature Pipeline Module
+"""
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+
+from src.model_manager import PIPELINE_PATH
+
+SENSOR_COLUMNS = [
+    'Air temperature [K]', 'Process temperature [K]', 'Rotational speed [rpm]',
+    'Torque [Nm]', 'Tool wear [min]'
+]
+
+# One-hot layout of pd.get_dummies(..., drop_first=True) on the training data:
+# H is the baseline, L and M get indicator columns
+TYPE_CATEGORIES = ['H', 'L', 'M']
+TYPE_COLUMNS = ['Type_L', 'Type_M']
+
+INTERACTION_COLUMNS = ['Temp_Diff', 'Power', 'Torque_Tool_Interaction']
+
+# Per-device history features (src.trend_features.TrendTracker)
+TREND_COLUMNS = ['Tool_Wear_Rate', 'Temp_Slope', 'Torque_Var']
+
+# Model input layout (order used when fitting the scaler)
+FEATURE_COLUMNS = SENSOR_COLUMNS + TYPE_COLUMNS + INTERACTION_COLUMNS
+
+# float32 readings (typed loader) are widened through their 4-decimal value,
+# so 298.1f becomes 298.1 exactly as parsed from the CSV, not 298.100006
+FLOAT32_DECIMALS = 4
+
+
+def interaction_features(air_temp, process_temp, rpm, torque, tool_wear):
+    """
+    Interaction terms shared by training and inference
+
+    Works on scalars, NumPy arrays and pandas Series.
+
+    Returns:
+    --------
+    tuple: Temp_Diff, Power (kW) and Torque_Tool_Interaction
+    """
+    temp_diff = process_temp - air_temp
+    power = torque * rpm / 9550  # Power in kW
+    torque_tool = torque * tool_wear
+    return temp_diff, power, torque_tool
+
+
+def sensor_values(values):
+    """
+    Sensor column as float64, undoing float32 storage rounding
+    """
+    values = np.asarray(values)
+    if values.dtype == np.float32:
+        return np.round(values.astype(np.float64), FLOAT32_DECIMALS)
+    return values.astype(np.float64)
+
+
+def add_interaction_features(df):
+    """
+    Add the interaction feature columns to a DataFrame
+
+    Parameters:
+    -----------
+    df : DataFrame
+        Data with the sensor columns
+
+    Returns:
+    --------
+    DataFrame: Copy with Temp_Diff, Power and Torque_Tool_Interaction added
+    """
+    df = df.copy()
+    terms = interaction_features(*(df[column] for column in SENSOR_COLUMNS))
+    for column, values in zip(INTERACTION_COLUMNS, terms):
+        df[column] = values
+    return df
+
+
+class SchemaEncoder:
+    """
+    Schema-locked encoder for the unscaled training columns
+
+    Always emits SENSOR_COLUMNS followed by one indicator per non-baseline
+    Type category (the pd.get_dummies(..., drop_first=True) layout of the
+    training data), whatever Type values the input contains. Works on
+    DataFrames, dicts of arrays and single-row dicts of scalars.
+
+    Parameters:
+    -----------
+    categories : list of str (optional)
+        Type categories, baseline first (default: TYPE_CATEGORIES)
+    """
+
+    def __init__(self, categories=None):
+        self.categories = list(categories if categories is not None else TYPE_CATEGORIES)
+
+    @property
+    def type_columns(self):
+        return [f'Type_{category}' for category in self.categories[1:]]
+
+    def feature_columns(self, engineer=False):
+        return SENSOR_COLUMNS + self.type_columns + (INTERACTION_COLUMNS if engineer else [])
+
+    def fit(self, data):
+        """
+        Lock the Type categories seen in the training data
+        """
+        self.categories = sorted(str(value) for value in pd.unique(np.asarray(data['Type'])))
+        return self
+
+    def type_indicators(self, data):
+        """
+        Type indicator columns as float64 arrays
+
+        Uses the Type_* columns when present, otherwise encodes Type.
+        """
+        if all(column in data for column in self.type_columns):
+            return [np.atleast_1d(np.asarray(data[column], dtype=np.float64))
+                    for column in self.type_columns]
+
+        equipment_type = np.atleast_1d(np.asarray(data['Type']))
+        unknown = ~np.isin(equipment_type, self.categories)
+        if unknown.any():
+            raise ValueError(f"Unknown equipment Type {str(equipment_type[unknown][0])!r}; "
+                             f"expected one of {self.categories}")
+        return [(equipment_type == category).astype(np.float64) for category in self.categories[1:]]
+
+    def encode_type(self, equipment_type):
+        """
+        Indicator dict for a single Type value, e.g. 'L' -> {'Type_L': 1, 'Type_M': 0}
+        """
+        indicators = self.type_indicators({'Type': equipment_type})
+        return {column: int(values[0]) for column, values in zip(self.type_columns, indicators)}
+
+    def transform(self, data, out=None, dtype=np.float64, engineer=False):
+        """
+        Encode rows straight into a (n_rows, n_columns) array
+
+        Parameters:
+        -----------
+        data : DataFrame, dict of array-like or dict of scalars
+            Sensor columns plus Type (or the Type_* columns)
+        out : ndarray (optional)
+            Preallocated array to fill
+        dtype : numpy dtype
+            Array dtype when out is not given
+        engineer : bool
+            Also emit INTERACTION_COLUMNS
+
+        Returns:
+        --------
+        ndarray: Encoded rows in feature_columns(engineer) order
+        """
+        sensors = [np.atleast_1d(sensor_values(data[column])) for column in SENSOR_COLUMNS]
+        columns = sensors + self.type_indicators(data)
+        if engineer:
+            columns += list(interaction_features(*sensors))
+
+        shape = (len(sensors[0]), len(columns))
+        if out is None:
+            out = np.empty(shape, dtype=dtype)
+        elif out.shape != shape:
+            raise ValueError(f"out has shape {out.shape}, expected {shape}")
+
+        for i, values in enumerate(columns):
+            out[:, i] = values
+        return out
+
+
+class FeaturePipeline:
+    """
+    Raw equipment readings -> scaled model input
+
+    Owns the column order, the Type one-hot mapping, the interaction terms
+    and the fitted StandardScaler. Scaling is folded into one affine
+    transform (x * scale + offset) applied to a NumPy matrix, so inference
+    needs no DataFrame construction or column-name lookups.
+
+    Parameters:
+    -----------
+    scaler : StandardScaler (optional)
+        Fitted scaler over feature_columns
+    trend_features : bool
+        Append TREND_COLUMNS (taken from the input as-is) to the layout
+    """
+
+    # Class default keeps pipelines pickled before trend features loadable
+    trend_features = False
+
+    def __init__(self, scaler=None, trend_features=False):
+        self.trend_features = trend_features
+        self.feature_columns = list(FEATURE_COLUMNS) + (TREND_COLUMNS if trend_features else [])
+        self.type_categories = list(TYPE_CATEGORIES)
+        self.scaler = scaler
+        self.scale_ = None
+        self.offset_ = None
+        if scaler is not None:
+            self._fold_scaler()
+
+    @property
+    def n_features(self):
+        return len(self.feature_columns)
+
+    def _fold_scaler(self):
+        # (x - mean) / std  ==  x * (1 / std) + (-mean / std)
+        n = self.n_features
+        scale = self.scaler.scale_ if self.scaler.scale_ is not None else np.ones(n)
+        mean = self.scaler.mean_ if self.scaler.mean_ is not None else np.zeros(n)
+        self.scale_ = 1.0 / np.asarray(scale, dtype=np.float64)
+        self.offset_ = -np.asarray(mean, dtype=np.float64) * self.scale_
+
+    def _columns(self, data):
+        """
+        Feature columns as float64 arrays, in the training column order
+        """
+        sensors = [sensor_values(data[column]) for column in SENSOR_COLUMNS]
+        yield from sensors
+
+        yield from SchemaEncoder(self.type_categories).type_indicators(data)
+
+        yield from interaction_features(*sensors)
+
+        if self.trend_features:
+            for column in TREND_COLUMNS:
+                yield np.asarray(data[column], dtype=np.float64)
+
+    def _allocate(self, data, out, dtype):
+        if out is None:
+            n_rows = len(np.atleast_1d(np.asarray(data[SENSOR_COLUMNS[0]])))
+            out = np.empty((n_rows, self.n_features), dtype=dtype)
+        return out
+
+    def raw_matrix(self, data, out=None, dtype=np.float64):
+        """
+        Unscaled feature matrix in the training column order
+
+        Parameters:
+        -----------
+        data : DataFrame or dict of array-like
+            Sensor columns plus either Type_L/Type_M or Type
+            (and TREND_COLUMNS when trend_features is set)
+        out : ndarray (optional)
+            Preallocated (n_rows, n_features) array to fill
+        dtype : numpy dtype
+            Matrix dtype when out is not given
+
+        Returns:
+        --------
+        ndarray: Feature matrix (n_rows, n_features)
+        """
+        out = self._allocate(data, out, dtype)
+        for i, values in enumerate(self._columns(data)):
+            out[:, i] = values
+        return out
+
+    def fit(self, data):
+        """
+        Fit the scaler on raw training data
+
+        Parameters:
+        -----------
+        data : DataFrame or dict of array-like
+            Training rows (sensor columns plus Type or Type_L/Type_M)
+
+        Returns:
+        --------
+        FeaturePipeline: self
+        """
+        features = pd.DataFrame(self.raw_matrix(data), columns=self.feature_columns)
+        self.scaler = StandardScaler().fit(features)
+        self._fold_scaler()
+        return self
+
+    def transform_matrix(self, X, out=None):
+        """
+        Scale a raw feature matrix with the folded affine transform
+        """
+        if out is None:
+            out = np.array(X, dtype=np.float64)
+        elif out is not X:
+            out[...] = X
+        out *= self.scale_
+        out += self.offset_
+        return out
+
+    def transform(self, data, out=None, dtype=np.float64):
+        """
+        Raw readings -> scaled model input in one pass
+
+        Each column is computed and scaled in float64 before it is stored,
+        so a float32 matrix holds exactly what the trees compare against
+        (they cast their input to float32) at half the memory.
+
+        Parameters:
+        -----------
+        data : DataFrame or dict of array-like
+            Sensor columns plus either Type_L/Type_M or Type
+        out : ndarray (optional)
+            Preallocated (n_rows, n_features) array to fill
+        dtype : numpy dtype
+            Matrix dtype when out is not given (float32 halves memory)
+
+        Returns:
+        --------
+        ndarray: Scaled feature matrix (n_rows, n_features)
+        """
+        out = self._allocate(data, out, dtype)
+        for i, values in enumerate(self._columns(data)):
+            out[:, i] = values * self.scale_[i] + self.offset_[i]
+        return out
+
+    def raw_record(self, record):
+        """
+        Unscaled model input for a single equipment dict
+
+        Returns:
+        --------
+        ndarray: Feature vector (n_features,) in feature_columns order
+        """
+        # Same encoding and validation as the batch path (_columns)
+        sensors = [float(sensor_values(record[column])) for column in SENSOR_COLUMNS]
+        types = [float(values[0]) for values in SchemaEncoder(self.type_categories).type_indicators(record)]
+
+        trends = [float(record[column]) for column in TREND_COLUMNS] if self.trend_features else []
+
+        return np.array(sensors + types + list(interaction_features(*sensors)) + trends)
+
+    def transform_record(self, record):
+        """
+        Scaled model input for a single equipment dict
+
+        Returns:
+        --------
+        ndarray: Scaled feature matrix (1, n_features)
+        """
+        return (self.raw_record(record) * self.scale_ + self.offset_)[None, :]
+
+    def save(self, path=PIPELINE_PATH):
+        joblib.dump(self, path)
+
+    @staticmethod
+    def load(path=PIPELINE_PATH, mmap_mode=None):
+        return joblib.load(path, mmap_mode=mmap_mode)
+
+    @classmethod
+    def from_scaler(cls, scaler):
+        """
+        Wrap an existing fitted scaler (e.g. models/scaler.pkl)
+        """
+        n_features = getattr(scaler, 'n_features_in_', len(FEATURE_COLUMNS))
+        return cls(scaler, trend_features=n_features == len(FEATURE_COLUMNS) + len(TREND_COLUMNS))
+
+
+if __name__ == "__main__":
+    from src.model_manager import get_model_manager
+
+    # Build the pipeline from the current scaler and save it next to the model
+    pipeline = FeaturePipeline.from_scaler(get_model_manager().scaler)
+    pipeline.save()
+    print(f"✅ Feature pipeline saved to: {PIPELINE_PATH}")
+    print(f"Columns: {pipeline.feature_columns}")
@@ -0,0 +1,240 @@
+"""
+Synthetic Fleet Generator Module
+"""
+
+import numpy as np
+import pandas as pd
+import time
+from scipy.special import ndtr, erfinv
+
+from src.feature_pipeline import SENSOR_COLUMNS, TYPE_CATEGORIES, SchemaEncoder
+
+# Quantiles kept per sensor and Type to reproduce the marginals
+N_QUANTILES = 512
+
+# Recorded resolution of each sensor in ai4i2020.csv
+SENSOR_RESOLUTION = {
+    'Air temperature [K]': 0.1,
+    'Process temperature [K]': 0.1,
+    'Rotational speed [rpm]': 1,
+    'Torque [Nm]': 0.1,
+    'Tool wear [min]': 1
+}
+
+
+class FleetModel:
+    """
+    Per-Type joint distribution of the sensor readings
+
+    A Gaussian copula: each Type keeps the empirical quantiles of every
+    sensor (the marginals) and the correlation matrix of the sensors'
+    normal scores (the dependence). Sampling draws correlated normals
+    and maps them through the quantile tables, all vectorized.
+
+    Parameters:
+    -----------
+    type_share : dict
+        Fraction of devices per Type
+    quantiles : dict
+        Type -> (n_sensors, N_QUANTILES) sensor quantile table
+    correlation : dict
+        Type -> (n_sensors, n_sensors) normal-score correlation matrix
+    """
+
+    def __init__(self, type_share, quantiles, correlation):
+        self.type_share = dict(type_share)
+        self.quantiles = {t: np.asarray(q, dtype=np.float64) for t, q in quantiles.items()}
+        self.correlation = {t: np.asarray(c, dtype=np.float64) for t, c in correlation.items()}
+        self._cholesky = {t: np.linalg.cholesky(c) for t, c in self.correlation.items()}
+        self._levels = np.linspace(0, 1, N_QUANTILES)
+
+    @property
+    def types(self):
+        return list(self.type_share)
+
+    @classmethod
+    def from_data(cls, df=None):
+        """
+        Fit the per-Type statistics of a dataset
+
+        Parameters:
+        -----------
+        df : DataFrame (optional)
+            Rows with Type and the sensor columns (default: ai4i2020.csv)
+
+        Returns:
+        --------
+        FleetModel: Fitted model
+        """
+        if df is None:
+            from src.data_preprocessing import load_data
+            df = load_data(typed=False)
+
+        levels = np.linspace(0, 1, N_QUANTILES)
+        counts = df['Type'].astype(str).value_counts()
+        type_share, quantiles, correlation = {}, {}, {}
+
+        for equipment_type in TYPE_CATEGORIES:
+            if equipment_type not in counts:
+                continue
+            values = df.loc[df['Type'].astype(str) == equipment_type, SENSOR_COLUMNS].to_numpy(np.float64)
+            type_share[equipment_type] = float(counts[equipment_type] / counts.sum())
+            quantiles[equipment_type] = np.quantile(values, levels, axis=0).T
+
+            # Normal scores of the ranks -> correlation of the copula
+            ranks = (pd.DataFrame(values).rank().to_numpy() - 0.5) / len(values)
+            scores = np.sqrt(2) * erfinv(2 * ranks - 1)
+            correlation[equipment_type] = np.corrcoef(scores, rowvar=False)
+
+        return cls(type_share, quantiles, correlation)
+
+    def sample(self, n, rng, equipment_type=None):
+        """
+        Draw sensor readings
+
+        Parameters:
+        -----------
+        n : int
+            Number of devices
+        rng : numpy Generator
+            Random source
+        equipment_type : str or ndarray (optional)
+            Type of every device (default: drawn from type_share)
+
+        Returns:
+        --------
+        ndarray, ndarray: Types (n,) and readings (n, n_sensors)
+        """
+        if equipment_type is None:
+            equipment_type = rng.choice(self.types, size=n, p=list(self.type_share.values()))
+        equipment_type = np.broadcast_to(np.asarray(equipment_type), (n,))
+
+        readings = np.empty((n, len(SENSOR_COLUMNS)))
+        for t in self.types:
+            rows = np.flatnonzero(equipment_type == t)
+            if len(rows) == 0:
+                continue
+            normals = rng.standard_normal((len(rows), len(SENSOR_COLUMNS))) @ self._cholesky[t].T
+            uniforms = ndtr(normals)
+            for j in range(len(SENSOR_COLUMNS)):
+                readings[rows, j] = np.interp(uniforms[:, j], self._levels, self.quantiles[t][j])
+
+        # Back to the resolution the sensors report at
+        for j, column in enumerate(SENSOR_COLUMNS):
+            step = SENSOR_RESOLUTION[column]
+            readings[:, j] = np.round(readings[:, j] / step) * step
+
+        return equipment_type, readings
+
+
+def _equipment_ids(start, stop, prefix, width):
+    numbers = np.char.zfill(np.arange(start, stop).astype(str), width)
+    return np.char.add(f'{prefix}-', numbers).astype(object)
+
+
+def generate_fleet(n_devices, batch_size=100_000, seed=42, model=None, id_prefix='EQ',
+                   dtype=np.float64):
+    """
+    Synthetic fleet in columnar batches
+
+    Only one batch exists at a time, so fleets of 10^7 devices never
+    fully materialize. Each batch has the columns predict_batch expects
+    (equipment_id, sensors, Type_L, Type_M) plus Type.
+
+    Parameters:
+    -----------
+    n_devices : int
+        Total devices to generate
+    batch_size : int
+        Devices per yielded batch
+    seed : int
+        Random seed (same seed -> same fleet)
+    model : FleetModel (optional)
+        Sensor distribution (default: fitted on ai4i2020.csv)
+    id_prefix : str
+        equipment_id prefix; ids are unique within the fleet
+    dtype : numpy dtype
+        Sensor dtype (float32 for compact batches)
+
+    Yields:
+    -------
+    DataFrame: Next batch of devices
+    """
+    if model is None:
+        model = FleetModel.from_data()
+    rng = np.random.default_rng(seed)
+    encoder = SchemaEncoder()
+    width = max(len(str(n_devices - 1)), 6)
+
+    for start in range(0, n_devices, batch_size):
+        stop = min(start + batch_size, n_devices)
+        equipment_type, readings = model.sample(stop - start, rng)
+
+        batch = {'equipment_id': _equipment_ids(start, stop, id_prefix, width),
+                 'Type': pd.Categorical(equipment_type, categories=TYPE_CATEGORIES)}
+        for j, column in enumerate(SENSOR_COLUMNS):
+            batch[column] = readings[:, j].astype(dtype)
+        for column, values in zip(encoder.type_columns, encoder.type_indicators(batch)):
+            batch[column] = values.astype(np.int8)
+
+        yield pd.DataFrame(batch)
+
+
+def generate_scored_fleet(n_devices, batch_size=100_000, seed=42, model=None, compact=False):
+    """
+    Synthetic fleet already run through predict_batch
+
+    Yields prediction frames in the format the maintenance scheduler and
+    spare-parts planner take.
+
+    Yields:
+    -------
+    DataFrame: Next batch of prediction results
+    """
+    from src.prediction import predict_batch
+
+    for batch in generate_fleet(n_devices, batch_size, seed, model,
+                                dtype=np.float32 if compact else np.float64):
+        yield predict_batch(batch, compact=compact)
+
+
+def compare_with_data(model, df, n=100_000, seed=0):
+    """
+    Per-Type mean and correlation gap between samples and the data
+
+    Returns:
+    --------
+    DataFrame: Type, max relative mean difference, max correlation difference
+    """
+    rng = np.random.default_rng(seed)
+    rows = []
+    for t in model.types:
+        real = df.loc[df['Type'].astype(str) == t, SENSOR_COLUMNS].to_numpy(np.float64)
+        _, synthetic = model.sample(n, rng, equipment_type=t)
+        rows.append({
+            'Type': t,
+            'mean_max_rel_diff': float(np.max(np.abs(synthetic.mean(0) / real.mean(0) - 1))),
+            'corr_max_abs_diff': float(np.max(np.abs(
+                np.corrcoef(synthetic, rowvar=False) - np.corrcoef(real, rowvar=False)
+            )))
+        })
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    from src.data_preprocessing import load_data
+
+    df = load_data(typed=False)
+    model = FleetModel.from_data(df)
+    print(f"Type share: { {t: round(s, 3) for t, s in model.type_share.items()} }")
+    print("\nSynthetic vs real statistics:")
+    print(compare_with_data(model, df).to_string(index=False))
+
+    print("\nFirst batch:")
+    print(next(generate_fleet(5, model=model)))
+
+    n_devices = 1_000_000
+    start = time.perf_counter()
+    rows = sum(len(batch) for batch in generate_fleet(n_devices, model=model))
+    elapsed = time.perf_counter() - start
+    print(f"\n✅ Generated {rows:,} devices in {elapsed:.2f}s ({rows / elapsed:,.0f} devices/sec)")
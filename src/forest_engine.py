@@ -0,0 +1,276 @@
+"""
+Compiled Random Forest Inference Module
+"""
+
+import numpy as np
+import time
+
+from src.model_manager import FOREST_PATH
+
+# Rows evaluated together; keeps the (rows x trees) index matrix in cache
+DEFAULT_BLOCK_SIZE = 256
+
+
+class CompiledForest:
+    """
+    Random Forest flattened into contiguous NumPy arrays
+
+    All trees share one node table with siblings stored next to each
+    other, so a split is `node = children_left[node] + (x > threshold)`.
+    Leaves point to themselves with an infinite threshold; every row can
+    then be walked through every tree for max_depth levels with a few
+    vectorized gathers and no per-tree Python dispatch.
+
+    Parameters:
+    -----------
+    feature : ndarray (n_nodes,)
+        Split feature of each node (0 for leaves)
+    threshold : ndarray (n_nodes,)
+        Split threshold of each node (+inf for leaves)
+    children_left : ndarray (n_nodes,)
+        Global index of the left child (self for leaves); the right
+        child is the next node
+    value : ndarray (n_nodes, n_classes)
+        Class probabilities of each node
+    roots : ndarray (n_trees,)
+        Global index of each tree's root
+    max_depth : int
+        Deepest leaf over all trees
+    classes : ndarray
+        Class labels (model.classes_)
+    """
+
+    def __init__(self, feature, threshold, children_left, value, roots,
+                 max_depth, classes):
+        self.feature = np.ascontiguousarray(feature, dtype=np.int32)
+        self.threshold = np.ascontiguousarray(threshold, dtype=np.float64)
+        self.children_left = np.ascontiguousarray(children_left, dtype=np.int32)
+        self.value = np.ascontiguousarray(value, dtype=np.float64)
+        self.roots = np.ascontiguousarray(roots, dtype=np.int32)
+        self.max_depth = int(max_depth)
+        self.classes_ = np.asarray(classes)
+
+        # sklearn compares float32 inputs against float64 thresholds. Rounding
+        # each threshold down to the nearest float32 gives the same decisions
+        # with half the memory traffic.
+        threshold32 = self.threshold.astype(np.float32)
+        rounded_up = threshold32.astype(np.float64) > self.threshold
+        threshold32[rounded_up] = np.nextafter(threshold32[rounded_up], np.float32(-np.inf))
+        self._threshold32 = threshold32
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    def apply(self, X):
+        """
+        Leaf reached by every row in every tree
+
+        Parameters:
+        -----------
+        X : array-like (n_samples, n_features)
+            Scaled model input
+
+        Returns:
+        --------
+        ndarray (n_samples, n_trees): Global leaf index
+        """
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        n_samples, n_features = X.shape
+        X_flat = X.ravel()
+        row_offset = (np.arange(n_samples, dtype=np.int32) * n_features)[:, None]
+        node = np.repeat(self.roots[None, :], n_samples, axis=0)
+
+        # Level by level: all rows and trees advance together
+        for _ in range(self.max_depth):
+            go_right = X_flat.take(row_offset + self.feature.take(node)) > self._threshold32.take(node)
+            node = self.children_left.take(node) + go_right
+
+        return node
+
+    def predict_proba(self, X, block_size=DEFAULT_BLOCK_SIZE):
+        """
+        Average class probabilities over all trees
+
+        Parameters:
+        -----------
+        X : array-like (n_samples, n_features)
+            Scaled model input
+        block_size : int
+            Rows evaluated at once
+
+        Returns:
+        --------
+        ndarray (n_samples, n_classes): Class probabilities
+        """
+        X = np.asarray(X)
+        proba = np.empty((X.shape[0], self.value.shape[1]))
+        for start in range(0, X.shape[0], block_size):
+            leaves = self.apply(X[start:start + block_size])
+            proba[start:start + block_size] = self.value.take(leaves, axis=0).mean(axis=1)
+        return proba
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+    def save(self, path=FOREST_PATH):
+        np.savez(
+            path,
+            feature=self.feature, threshold=self.threshold,
+            children_left=self.children_left,
+            value=self.value, roots=self.roots,
+            max_depth=self.max_depth, classes=self.classes_
+        )
+
+    @classmethod
+    def load(cls, path=FOREST_PATH):
+        with np.load(path, allow_pickle=False) as arrays:
+            return cls(
+                arrays['feature'], arrays['threshold'],
+                arrays['children_left'], arrays['value'], arrays['roots'],
+                int(arrays['max_depth']), arrays['classes']
+            )
+
+
+def compile_forest(model):
+    """
+    Flatten a fitted RandomForestClassifier into a CompiledForest
+
+    Parameters:
+    -----------
+    model : RandomForestClassifier
+        Fitted forest (binary or multi-class, single output)
+
+    Returns:
+    --------
+    CompiledForest: Array-backed copy of the forest
+    """
+    features, thresholds, lefts, values, roots = [], [], [], [], []
+    offset = 0
+    max_depth = 0
+
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        n_nodes = tree.node_count
+
+        # Breadth-first relabelling so every right child follows its sibling
+        order = np.empty(n_nodes, dtype=np.intp)
+        order[0] = 0
+        head, tail = 0, 1
+        while head < tail:
+            old_id = order[head]
+            if tree.children_left[old_id] != -1:
+                order[tail] = tree.children_left[old_id]
+                order[tail + 1] = tree.children_right[old_id]
+                tail += 2
+            head += 1
+        new_id = np.empty(n_nodes, dtype=np.intp)
+        new_id[order] = np.arange(n_nodes)
+
+        is_leaf = tree.children_left[order] == -1
+        left = np.where(is_leaf, np.arange(n_nodes), new_id[tree.children_left[order]])
+
+        features.append(np.where(is_leaf, 0, tree.feature[order]))
+        thresholds.append(np.where(is_leaf, np.inf, tree.threshold[order]))
+        lefts.append(left + offset)
+
+        # Normalize counts/weights into per-node class probabilities
+        value = tree.value[order, 0, :].astype(np.float64)
+        normalizer = value.sum(axis=1, keepdims=True)
+        normalizer[normalizer == 0.0] = 1.0
+        values.append(value / normalizer)
+
+        roots.append(offset)
+        max_depth = max(max_depth, tree.max_depth)
+        offset += n_nodes
+
+    return CompiledForest(
+        np.concatenate(features), np.concatenate(thresholds),
+        np.concatenate(lefts), np.concatenate(values), np.array(roots),
+        max_depth, model.classes_
+    )
+
+
+def export_forest(model, path=FOREST_PATH):
+    """
+    Compile a forest and save its arrays next to the model
+
+    Returns:
+    --------
+    CompiledForest: The exported forest
+    """
+    forest = compile_forest(model)
+    forest.save(path)
+    return forest
+
+
+def check_parity(model, forest, X, atol=1e-9):
+    """
+    Compare CompiledForest probabilities with model.predict_proba
+
+    Returns:
+    --------
+    dict: Max absolute difference, class agreement and pass flag
+    """
+    expected = model.predict_proba(X)
+    actual = forest.predict_proba(X)
+    max_abs_diff = float(np.max(np.abs(expected - actual))) if len(X) else 0.0
+
+    return {
+        'rows': len(X),
+        'max_abs_diff': max_abs_diff,
+        'class_agreement': float(np.mean(
+            np.argmax(expected, axis=1) == np.argmax(actual, axis=1)
+        )) if len(X) else 1.0,
+        'passed': max_abs_diff <= atol
+    }
+
+
+def benchmark(model, forest, X, single_row_repeats=200):
+    """
+    Time single-row latency and batch throughput against sklearn
+
+    Returns:
+    --------
+    dict: Timings in milliseconds and rows/sec
+    """
+    def _timed(fn, *args):
+        start = time.perf_counter()
+        fn(*args)
+        return time.perf_counter() - start
+
+    X = np.asarray(X)
+    row = X[:1]
+
+    results = {}
+    for name, predict_proba in [('sklearn', model.predict_proba),
+                                ('compiled', forest.predict_proba)]:
+        predict_proba(row)  # warm-up
+        single = sorted(_timed(predict_proba, row) for _ in range(single_row_repeats))
+        batch = _timed(predict_proba, X)
+        results[name] = {
+            'single_row_p50_ms': single[len(single) // 2] * 1000,
+            'batch_rows': len(X),
+            'batch_ms': batch * 1000,
+            'batch_rows_per_sec': len(X) / batch if batch > 0 else float('inf')
+        }
+
+    return results
+
+
+if __name__ == "__main__":
+    from src.model_manager import get_model_manager
+    from src.data_preprocessing import load_data
+
+    models = get_model_manager()
+    forest = export_forest(models.model)
+    print(f"Exported {forest.n_trees} trees, {len(forest.feature)} nodes to: {FOREST_PATH}")
+
+    X = models.pipeline.transform(load_data())
+
+    print(f"\nParity: {check_parity(models.model, forest, X)}")
+
+    print("\nBenchmark:")
+    for name, timing in benchmark(models.model, forest, X).items():
+        print(f"  {name:>8}: single row {timing['single_row_p50_ms']:.3f} ms, "
+              f"batch {timing['batch_rows_per_sec']:,.0f} rows/sec")
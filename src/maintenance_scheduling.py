@@ -5,9 +5,74 @@ Maintenance Scheduling Module
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+import heapq
+import time
 
+# Priority levels, lowest first (categorical order in compact mode)
+PRIORITY_CATEGORIES = ['Low', 'Medium', 'High']
 
-def create_maintenance_schedule(predictions_df, days_ahead=30):
+# Columns of assign_maintenance_dates for the minimal prediction input
+SCHEDULE_COLUMNS = [
+    'equipment_id', 'predicted_failure_prob', 'days_to_failure', 'priority', 'urgency_score',
+    'scheduled_maintenance_date', 'deadline_date', 'late', 'days_late'
+]
+
+# Failure probability from which a job is Medium / High priority
+MEDIUM_PRIORITY_PROB = 0.5
+HIGH_PRIORITY_PROB = 0.7
+
+
+def priority_levels(probs):
+    """
+    Priority of every failure probability as an index into PRIORITY_CATEGORIES
+    
+    Returns:
+    --------
+    ndarray: int8 codes (0 Low, 1 Medium, 2 High)
+    """
+    probs = np.asarray(probs, dtype=np.float64)
+    return np.select(
+        [probs >= HIGH_PRIORITY_PROB, probs >= MEDIUM_PRIORITY_PROB], [2, 1], 0
+    ).astype(np.int8)
+
+
+def urgency_scores(probs, days_to_failure, max_days_to_failure):
+    """
+    Urgency of every job: 70% failure probability, 30% time left
+    
+    Parameters:
+    -----------
+    probs : array-like
+        Failure probabilities
+    days_to_failure : array-like
+        Days until the predicted failure
+    max_days_to_failure : float
+        Days that count as no time pressure (larger values are clipped)
+        
+    Returns:
+    --------
+    ndarray: Urgency scores (higher is more urgent)
+    """
+    probs = np.asarray(probs, dtype=np.float64)
+    time_left = np.minimum(np.asarray(days_to_failure, dtype=np.float64) / max(max_days_to_failure, 1), 1.0)
+    return probs * 0.7 + (1 - time_left) * 0.3
+
+
+def top_k_indices(values, k):
+    """
+    Positions of the k largest values, largest first
+    
+    Uses a partial selection (O(n)) and sorts only the k selected values.
+    """
+    values = np.asarray(values)
+    k = min(int(k), len(values))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    top = np.argpartition(values, len(values) - k)[len(values) - k:]
+    return top[np.argsort(-values[top], kind='stable')]
+
+
+def create_maintenance_schedule(predictions_df, days_ahead=30, compact=False):
     """
     Create optimized maintenance schedule
     
@@ -17,6 +82,8 @@ def create_maintenance_schedule(predictions_df, days_ahead=30):
         Predictions with failure probabilities
     days_ahead : int
         Number of days to schedule ahead
+    compact : bool
+        Store priority as an ordered categorical and urgency as float32
         
     Returns:
     --------
@@ -24,16 +91,19 @@ def create_maintenance_schedule(predictions_df, days_ahead=30):
     """
     schedule = predictions_df.copy()
     
+    probs = schedule['predicted_failure_prob'].to_numpy(np.float64)
+    days_to_failure = schedule['days_to_failure'].to_numpy(np.float64)
+    
     # Assign priority based on failure probability
-    schedule['priority'] = schedule['predicted_failure_prob'].apply(
-        lambda x: 'High' if x >= 0.7 else ('Medium' if x >= 0.5 else 'Low')
-    )
+    levels = priority_levels(probs)
+    if compact:
+        schedule['priority'] = pd.Categorical.from_codes(levels, categories=PRIORITY_CATEGORIES, ordered=True)
+    else:
+        schedule['priority'] = np.array(PRIORITY_CATEGORIES, dtype=object)[levels]
     
     # Assign urgency score
-    schedule['urgency_score'] = (
-        schedule['predicted_failure_prob'] * 0.7 + 
-        (1 - schedule['days_to_failure'] / schedule['days_to_failure'].max()) * 0.3
-    )
+    urgency = urgency_scores(probs, days_to_failure, days_to_failure.max() if len(schedule) else 1)
+    schedule['urgency_score'] = urgency.astype(np.float32) if compact else urgency
     
     # Sort by urgency
     schedule = schedule.sort_values('urgency_score', ascending=False)
@@ -41,57 +111,896 @@ def create_maintenance_schedule(predictions_df, days_ahead=30):
     return schedule
 
 
-def assign_maintenance_dates(schedule_df, start_date=None, max_daily_capacity=3):
+def capacity_schedule(deadlines, urgency, max_daily_capacity):
+    """
+    Place unit jobs into days of fixed capacity, meeting as many deadlines as possible
+    
+    Jobs are taken in deadline order and kept in a min-heap by urgency;
+    whenever the kept jobs exceed the capacity up to the current
+    deadline, the least urgent one is dropped as late (Moore-Hodgson).
+    The kept jobs are then laid out earliest deadline first, so each
+    lands on the earliest free day on or before its deadline, and the
+    late jobs fill the days after them. O(n log n).
+    
+    Parameters:
+    -----------
+    deadlines : array-like of int
+        Last acceptable day of each job (days from the start date)
+    urgency : array-like of float
+        Which jobs to keep on time when capacity is short (higher first)
+    max_daily_capacity : int
+        Jobs per day
+        
+    Returns:
+    --------
+    ndarray: Assigned day of every job
+    """
+    if max_daily_capacity < 1:
+        raise ValueError("max_daily_capacity must be at least 1")
+    
+    deadlines = np.asarray(deadlines, dtype=np.int64)
+    urgency = np.asarray(urgency, dtype=np.float64)
+    order = np.lexsort((-urgency, deadlines))
+    
+    on_time = []
+    late = np.zeros(len(deadlines), dtype=bool)
+    urgency_list = urgency.tolist()
+    deadline_list = deadlines.tolist()
+    for job in order.tolist():
+        heapq.heappush(on_time, (urgency_list[job], job))
+        if len(on_time) > max_daily_capacity * (deadline_list[job] + 1):
+            late[heapq.heappop(on_time)[1]] = True
+    
+    # On-time jobs first, late ones after; both in deadline order
+    layout = np.concatenate([order[~late[order]], order[late[order]]])
+    days = np.empty(len(deadlines), dtype=np.int64)
+    days[layout] = np.arange(len(layout)) // max_daily_capacity
+    return days
+
+
+def _is_compact(schedule_df):
+    # create_maintenance_schedule(compact=True) / predict_batch(compact=True) output
+    return (isinstance(schedule_df.get('priority', pd.Series(dtype=object)).dtype, pd.CategoricalDtype)
+            or schedule_df['predicted_failure_prob'].dtype == np.float32)
+
+
+def assign_maintenance_dates(schedule_df, start_date=None, max_daily_capacity=3, safety_margin_days=0,
+                             compact=None):
     """
     Assign specific maintenance dates based on capacity
     
+    Every job, whatever its priority, takes one slot of the daily
+    capacity and goes to the earliest free day on or before its deadline
+    (days_to_failure minus safety_margin_days); see capacity_schedule.
+    
     Parameters:
     -----------
     schedule_df : DataFrame
-        Schedule with priorities
+        Schedule with priorities (and urgency_score, days_to_failure)
     start_date : datetime (optional)
         Start date for scheduling
     max_daily_capacity : int
         Maximum maintenance jobs per day
+    safety_margin_days : int
+        Days before the predicted failure the job must be done
+    compact : bool (optional)
+        Keep the dates as datetime64 and days_late as int16 instead of
+        Python objects (default: when the schedule is compact, i.e.
+        categorical priority or float32 probabilities)
         
     Returns:
     --------
-    DataFrame: Schedule with assigned dates
+    DataFrame: Schedule with scheduled_maintenance_date, deadline_date,
+    late (could not be placed by its deadline) and days_late
     """
     if start_date is None:
         start_date = datetime.today()
+    if compact is None:
+        compact = _is_compact(schedule_df)
     
     schedule = schedule_df.copy()
-    assigned_dates = []
-    current_date = start_date
-    daily_count = 0
-    
-    for idx, row in schedule.iterrows():
-        # High priority: schedule immediately
-        if row['priority'] == 'High':
-            assigned_dates.append(current_date)
-            daily_count += 1
-        # Medium priority: schedule within a week
-        elif row['priority'] == 'Medium':
-            assigned_dates.append(current_date + timedelta(days=3))
-        # Low priority: schedule based on suggested date
+    if len(schedule) == 0:
+        for column in ['scheduled_maintenance_date', 'deadline_date', 'late', 'days_late']:
+            schedule[column] = pd.Series(dtype='datetime64[s]' if compact and 'date' in column else object)
+        return schedule
+    
+    deadlines = np.maximum(schedule['days_to_failure'].to_numpy(np.int64) - safety_margin_days, 0)
+    urgency = schedule['urgency_score' if 'urgency_score' in schedule else 'predicted_failure_prob']
+    days = capacity_schedule(deadlines, urgency.to_numpy(np.float64), max_daily_capacity)
+    
+    start = np.datetime64(pd.Timestamp(start_date).date(), 'D')
+    scheduled_dates = start + days
+    deadline_dates = start + deadlines
+    days_late = np.maximum(days - deadlines, 0)
+    if not compact:
+        scheduled_dates = scheduled_dates.astype(object)
+        deadline_dates = deadline_dates.astype(object)
+    schedule['scheduled_maintenance_date'] = scheduled_dates
+    schedule['deadline_date'] = deadline_dates
+    schedule['late'] = days > deadlines
+    schedule['days_late'] = days_late.astype(np.int16) if compact else days_late
+    
+    return schedule
+
+
+def benchmark_capacity_scheduler(n_jobs=100_000, max_daily_capacity=500, seed=42):
+    """
+    Time assign_maintenance_dates on a random schedule
+    
+    Returns:
+    --------
+    dict: Jobs, seconds, jobs/sec and number of late jobs
+    """
+    rng = np.random.default_rng(seed)
+    predictions = pd.DataFrame({
+        'equipment_id': [f'EQ-{i:06d}' for i in range(n_jobs)],
+        'predicted_failure_prob': rng.random(n_jobs).round(3),
+        'days_to_failure': rng.integers(0, 126, n_jobs)
+    })
+    schedule = create_maintenance_schedule(predictions)
+    
+    start = time.perf_counter()
+    schedule = assign_maintenance_dates(schedule, max_daily_capacity=max_daily_capacity)
+    elapsed = time.perf_counter() - start
+    
+    return {
+        'jobs': n_jobs,
+        'seconds': elapsed,
+        'jobs_per_sec': n_jobs / elapsed,
+        'late_jobs': int(schedule['late'].sum())
+    }
+
+
+class CalendarIndex:
+    """
+    Jobs per day and priority, with prefix sums for range counts
+    
+    Counts live in a (days, priorities) array updated in O(1) as jobs are
+    assigned or moved; the cumulative array is refreshed lazily (one
+    cumsum over the horizon) on the first query after a change, after
+    which every date-range count is two lookups.
+    
+    Parameters:
+    -----------
+    start_date : datetime
+        Day 0 of the index
+    n_days : int
+        Initial number of days (grows on demand)
+    """
+    
+    def __init__(self, start_date, n_days=64):
+        self.start_date = np.datetime64(pd.Timestamp(start_date).date(), 'D')
+        self.counts = np.zeros((max(n_days, 1), len(PRIORITY_CATEGORIES)), dtype=np.int64)
+        self._cumulative = None
+    
+    @property
+    def n_days(self):
+        return len(self.counts)
+    
+    @classmethod
+    def from_schedule(cls, schedule_df, start_date=None):
+        """
+        Index the scheduled_maintenance_date and priority columns in one pass
+        
+        Parameters:
+        -----------
+        schedule_df : DataFrame
+            Schedule from assign_maintenance_dates
+        start_date : datetime (optional)
+            Day 0 (default: today, or the earliest scheduled date if earlier)
+        """
+        dates = np.asarray(schedule_df['scheduled_maintenance_date'], dtype='datetime64[D]')
+        start = np.datetime64(pd.Timestamp(start_date if start_date is not None else datetime.today()).date(), 'D')
+        if len(dates) and start_date is None:
+            start = min(start, dates.min())
+        
+        days = (dates - start).astype(np.int64)
+        if (days < 0).any():
+            raise ValueError("Schedule has dates before start_date")
+        levels = pd.Categorical(schedule_df['priority'], categories=PRIORITY_CATEGORIES).codes
+        
+        index = cls(start, int(days.max()) + 1 if len(days) else 1)
+        np.add.at(index.counts, (days, levels), 1)
+        return index
+    
+    def day_offset(self, date):
+        """
+        Days from start_date of a date (ints are taken as offsets already)
+        """
+        if isinstance(date, (int, np.integer)):
+            return int(date)
+        return int((np.datetime64(pd.Timestamp(date).date(), 'D') - self.start_date).astype(np.int64))
+    
+    def add(self, day, level, count=1):
+        """
+        Add (or with a negative count, remove) jobs on a day for a priority index
+        """
+        if day >= len(self.counts):
+            grown = np.zeros((max(2 * len(self.counts), day + 1), self.counts.shape[1]), dtype=np.int64)
+            grown[:len(self.counts)] = self.counts
+            self.counts = grown
+        self.counts[day, level] += count
+        self._cumulative = None
+    
+    def _prefix(self):
+        if self._cumulative is None:
+            # Row i holds the counts of days < i
+            self._cumulative = np.zeros((len(self.counts) + 1, self.counts.shape[1]), dtype=np.int64)
+            np.cumsum(self.counts, axis=0, out=self._cumulative[1:])
+        return self._cumulative
+    
+    def _levels(self, priority):
+        if priority is None:
+            return slice(None)
+        return [PRIORITY_CATEGORIES.index(p) for p in np.atleast_1d(priority)]
+    
+    def count(self, start=None, end=None, priority=None):
+        """
+        Jobs scheduled between two dates (inclusive)
+        
+        Parameters:
+        -----------
+        start, end : date, str or int (optional)
+            Range bounds as dates or day offsets (default: whole index)
+        priority : str or list of str (optional)
+            Only these priority levels
+            
+        Returns:
+        --------
+        int: Number of jobs
+        """
+        cumulative = self._prefix()
+        lo = 0 if start is None else min(max(self.day_offset(start), 0), self.n_days)
+        hi = self.n_days if end is None else min(max(self.day_offset(end) + 1, 0), self.n_days)
+        if hi <= lo:
+            return 0
+        return int((cumulative[hi, self._levels(priority)] - cumulative[lo, self._levels(priority)]).sum())
+    
+    def histogram(self, bucket_days=7, priority=None, n_buckets=None):
+        """
+        Jobs per bucket of consecutive days (e.g. per week) from start_date
+        
+        Returns:
+        --------
+        ndarray: Job count per bucket
+        """
+        cumulative = self._prefix()[:, self._levels(priority)].sum(axis=1)
+        if n_buckets is None:
+            n_buckets = -(-self.n_days // bucket_days)
+        edges = np.minimum(np.arange(n_buckets + 1) * bucket_days, self.n_days)
+        return np.diff(cumulative[edges])
+
+
+class _ArgMaxTree:
+    """
+    Segment tree over days answering "largest value in [lo, hi) and its day"
+
+    Grows (doubling) when a day past the end is updated.
+    """
+
+    def __init__(self, size=64):
+        self.size = 1
+        while self.size < size:
+            self.size *= 2
+        self.tree = [-np.inf] * (2 * self.size)
+
+    def value(self, index):
+        return self.tree[index + self.size] if index < self.size else -np.inf
+
+    def update(self, index, value):
+        if index >= self.size:
+            self._grow(index + 1)
+        node = index + self.size
+        self.tree[node] = value
+        node //= 2
+        while node:
+            self.tree[node] = max(self.tree[2 * node], self.tree[2 * node + 1])
+            node //= 2
+
+    def _grow(self, size):
+        leaves = self.tree[self.size:]
+        while self.size < size:
+            self.size *= 2
+        self.tree = [-np.inf] * (2 * self.size)
+        self.tree[self.size:self.size + len(leaves)] = leaves
+        for node in range(self.size - 1, 0, -1):
+            self.tree[node] = max(self.tree[2 * node], self.tree[2 * node + 1])
+
+    def argmax(self, lo, hi):
+        """
+        (value, index) of the largest value in [lo, hi), or None if all are -inf
+        """
+        lo, hi = max(lo, 0) + self.size, min(hi, self.size) + self.size
+        best = None
+        while lo < hi:
+            if lo & 1:
+                if best is None or self.tree[lo] > self.tree[best]:
+                    best = lo
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                if best is None or self.tree[hi] > self.tree[best]:
+                    best = hi
+            lo //= 2
+            hi //= 2
+        if best is None or self.tree[best] == -np.inf:
+            return None
+        # Walk down to the leaf holding the maximum
+        while best < self.size:
+            best = 2 * best if self.tree[2 * best] == self.tree[best] else 2 * best + 1
+        return self.tree[best], best - self.size
+
+
+class ScheduleState:
+    """
+    Capacity schedule kept in memory and patched one prediction at a time
+    
+    Keeps job -> day and day -> jobs indexes, a heap of days with free
+    capacity, per-day urgency heaps with a segment tree over the least
+    urgent job of each day, and late jobs bucketed by deadline with a
+    segment tree over the most urgent one per deadline. Every lookup is
+    logarithmic, so an update costs O(jobs moved * log), not a scan of
+    the fleet. Urgency, priority
+    and days are also mirrored in arrays (one slot per job) so
+    top_k_urgent answers with a partial selection instead of a sort, and
+    `calendar` (a CalendarIndex) follows every assignment for date-range
+    counts.
+    
+    Placement rules match assign_maintenance_dates: one capacity slot per
+    job, earliest free day on or before the deadline; when none is free a
+    less urgent job is bumped (and re-placed the same way), otherwise the
+    job goes late to the earliest free day. A freed slot is refilled by
+    the most urgent late job that can still meet its deadline there, and
+    so on into the slot that job leaves, so no late job ever has a free
+    day on or before its deadline. Local patches can leave a few
+    more late jobs than a full schedule would; rebuild() restores the
+    optimal on-time count.
+    
+    Parameters:
+    -----------
+    start_date : datetime (optional)
+        Day 0 of the schedule (default: today)
+    max_daily_capacity : int
+        Maximum maintenance jobs per day
+    safety_margin_days : int
+        Days before the predicted failure the job must be done
+    max_days_to_failure : int (optional)
+        Normalizer of the urgency score (fixed so updates stay local)
+    """
+    
+    def __init__(self, start_date=None, max_daily_capacity=3, safety_margin_days=0,
+                 max_days_to_failure=None):
+        if max_daily_capacity < 1:
+            raise ValueError("max_daily_capacity must be at least 1")
+        self.start_date = pd.Timestamp(start_date if start_date is not None else datetime.today()).normalize()
+        self.capacity = max_daily_capacity
+        self.safety_margin_days = safety_margin_days
+        self.max_days_to_failure = max_days_to_failure
+        
+        self._jobs = {}                     # equipment_id -> row fields
+        self._reset_placement()
+        
+        # Columnar mirror of the jobs for vectorized queries
+        self._slots = {}                    # equipment_id -> array slot
+        self._slot_ids = []                 # array slot -> equipment_id (None when free)
+        self._free_slots = []
+        self._urgency_arr = np.full(1024, -np.inf)
+        self._level_arr = np.zeros(1024, dtype=np.int8)
+        self._days_arr = np.zeros(1024, dtype=np.int64)
+        self._deadline_arr = np.zeros(1024, dtype=np.int64)
+        self._day_arr = np.zeros(1024, dtype=np.int64)
+    
+    def _reset_placement(self):
+        self._day = {}                      # equipment_id -> day
+        self._day_jobs = {}                 # day -> set of equipment_id
+        self._day_heaps = {}                # day -> [(urgency, equipment_id)], lazy deletion
+        self._least_tree = _ArgMaxTree()    # day -> -urgency of its least urgent job (may be stale)
+        self._free_days = []                # days below capacity, lazy deletion
+        self._free_day_set = set()          # days currently in _free_days (each at most once)
+        self._horizon = 0                   # every day >= horizon is empty
+        self._late = set()
+        self._late_heaps = {}               # deadline -> [(-urgency, equipment_id)], lazy deletion
+        self._late_tree = _ArgMaxTree()     # deadline -> urgency of its most urgent late job (may be stale)
+        
+        self.calendar = CalendarIndex(self.start_date)
+        self._calendar_level = {}           # equipment_id -> priority index counted in the calendar
+    
+    def __len__(self):
+        return len(self._jobs)
+    
+    def __contains__(self, equipment_id):
+        return equipment_id in self._jobs
+    
+    @classmethod
+    def build(cls, predictions_df, start_date=None, max_daily_capacity=3, safety_margin_days=0):
+        """
+        Schedule a whole prediction table at once (see assign_maintenance_dates)
+        
+        Returns:
+        --------
+        ScheduleState: State holding the schedule
+        """
+        # One job per device: a repeated equipment_id keeps its last prediction (as sync() does)
+        predictions_df = predictions_df.drop_duplicates('equipment_id', keep='last')
+        max_days = int(predictions_df['days_to_failure'].max()) if len(predictions_df) else 1
+        state = cls(start_date, max_daily_capacity, safety_margin_days, max(max_days, 1))
+        if len(predictions_df) == 0:
+            return state
+        
+        schedule = create_maintenance_schedule(predictions_df)
+        deadlines = np.maximum(schedule['days_to_failure'].to_numpy(np.int64) - safety_margin_days, 0)
+        days = capacity_schedule(deadlines, schedule['urgency_score'].to_numpy(np.float64), max_daily_capacity)
+        
+        slots = []
+        for record, deadline, day in zip(schedule.to_dict('records'), deadlines.tolist(), days.tolist()):
+            record['deadline'] = deadline
+            state._jobs[record['equipment_id']] = record
+            slots.append(state._slot_for(record['equipment_id']))
+            state._assign(record['equipment_id'], day)
+        
+        slots = np.array(slots, dtype=np.int64)
+        state._urgency_arr[slots] = schedule['urgency_score'].to_numpy(np.float64)
+        state._level_arr[slots] = priority_levels(schedule['predicted_failure_prob'])
+        state._days_arr[slots] = schedule['days_to_failure'].to_numpy(np.int64)
+        state._deadline_arr[slots] = deadlines
+        return state
+    
+    # ---- indexes ------------------------------------------------------------
+    
+    def _slot_for(self, equipment_id):
+        slot = self._slots.get(equipment_id)
+        if slot is not None:
+            return slot
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self._slot_ids[slot] = equipment_id
+        else:
+            slot = len(self._slot_ids)
+            self._slot_ids.append(equipment_id)
+            if slot >= len(self._urgency_arr):
+                self._grow()
+        self._slots[equipment_id] = slot
+        return slot
+    
+    def _grow(self):
+        # Doubling keeps appends amortized O(1)
+        for name in ['_urgency_arr', '_level_arr', '_days_arr', '_deadline_arr', '_day_arr']:
+            old = getattr(self, name)
+            new = np.full(2 * len(old), -np.inf) if name == '_urgency_arr' else np.zeros(2 * len(old), old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+    
+    def _urgency(self, equipment_id):
+        return self._jobs[equipment_id]['urgency_score']
+    
+    def _assign(self, equipment_id, day):
+        self._day[equipment_id] = day
+        self._day_arr[self._slots[equipment_id]] = day
+        level = PRIORITY_CATEGORIES.index(self._jobs[equipment_id]['priority'])
+        self.calendar.add(day, level)
+        self._calendar_level[equipment_id] = level
+        jobs = self._day_jobs.setdefault(day, set())
+        jobs.add(equipment_id)
+        urgency = self._urgency(equipment_id)
+        heap = self._day_heaps.setdefault(day, [])
+        heapq.heappush(heap, (urgency, equipment_id))
+        if len(heap) > 2 * len(jobs) + 8:
+            # Drop stale entries so long sessions of updates keep the heap small
+            heap[:] = [(self._urgency(job), job) for job in jobs]
+            heapq.heapify(heap)
+        if -urgency > self._least_tree.value(day):
+            self._least_tree.update(day, -urgency)
+        while self._horizon <= day:
+            if self._horizon != day:
+                self._push_free_day(self._horizon)
+            self._horizon += 1
+        if len(jobs) < self.capacity:
+            self._push_free_day(day)
+        deadline = self._jobs[equipment_id]['deadline']
+        if day > deadline:
+            self._late.add(equipment_id)
+            heap = self._late_heaps.setdefault(deadline, [])
+            heapq.heappush(heap, (-urgency, equipment_id))
+            if len(heap) > 64 and len(heap) > 4 * len(self._late):
+                self._compact_late_heap(deadline)
+            if urgency > self._late_tree.value(deadline):
+                self._late_tree.update(deadline, urgency)
+        else:
+            self._late.discard(equipment_id)
+    
+    def _unassign(self, equipment_id):
+        day = self._day.pop(equipment_id)
+        self._day_jobs[day].discard(equipment_id)
+        self._late.discard(equipment_id)
+        self.calendar.add(day, self._calendar_level.pop(equipment_id), -1)
+        self._push_free_day(day)
+        return day
+    
+    def _push_free_day(self, day):
+        # Each day sits in the heap at most once, so it never outgrows the horizon
+        if day not in self._free_day_set:
+            self._free_day_set.add(day)
+            heapq.heappush(self._free_days, day)
+    
+    def _earliest_free_day(self):
+        while self._free_days and len(self._day_jobs.get(self._free_days[0], ())) >= self.capacity:
+            self._free_day_set.discard(heapq.heappop(self._free_days))
+        return self._free_days[0] if self._free_days else self._horizon
+    
+    def _least_urgent(self, day):
+        # Least urgent job of a day; refreshes the day's tree entry
+        heap = self._day_heaps.get(day)
+        while heap:
+            urgency, equipment_id = heap[0]
+            if self._day.get(equipment_id) == day and self._urgency(equipment_id) == urgency:
+                self._least_tree.update(day, -urgency)
+                return urgency, equipment_id
+            heapq.heappop(heap)
+        self._least_tree.update(day, -np.inf)
+        return None
+    
+    def _least_urgent_until(self, last_day):
+        """
+        (urgency, equipment_id, day) of the least urgent job on days 0..last_day
+        """
+        while True:
+            found = self._least_tree.argmax(0, last_day + 1)
+            if found is None:
+                return None
+            value, day = found
+            least = self._least_urgent(day)
+            # Tree entries can be stale (job moved away); retry once refreshed
+            if least is not None and -least[0] == value:
+                return least[0], least[1], day
+    
+    def _is_late_entry(self, urgency, equipment_id, deadline):
+        job = self._jobs.get(equipment_id)
+        return (equipment_id in self._late and job['deadline'] == deadline
+                and job['urgency_score'] == urgency)
+    
+    def _compact_late_heap(self, deadline):
+        heap = self._late_heaps[deadline]
+        heap[:] = [entry for entry in heap if self._is_late_entry(-entry[0], entry[1], deadline)]
+        heapq.heapify(heap)
+    
+    def _most_urgent_late(self, first_deadline):
+        """
+        Most urgent late job whose deadline is first_deadline or later
+        """
+        while True:
+            found = self._late_tree.argmax(first_deadline, self._late_tree.size)
+            if found is None:
+                return None
+            value, deadline = found
+            heap = self._late_heaps.get(deadline, [])
+            while heap and not self._is_late_entry(-heap[0][0], heap[0][1], deadline):
+                heapq.heappop(heap)
+            top = -heap[0][0] if heap else -np.inf
+            if top == value:
+                return heap[0][1]
+            self._late_tree.update(deadline, top)
+    
+    # ---- placement ----------------------------------------------------------
+    
+    def _insert(self, equipment_id, moved):
+        job = equipment_id
+        while job is not None:
+            deadline = self._jobs[job]['deadline']
+            day = self._earliest_free_day()
+            if day <= deadline:
+                self._assign(job, day)
+                return
+            
+            # No free day in time: bump the least urgent job scheduled by the deadline
+            victim = self._least_urgent_until(deadline)
+            if victim is None or victim[0] >= self._urgency(job):
+                self._assign(job, day)
+                return
+            
+            self._unassign(victim[1])
+            self._assign(job, victim[2])
+            moved.append(victim[1])
+            job = victim[1]
+    
+    def _backfill(self, day, moved):
+        # A freed slot goes to the most urgent late job that is on time there;
+        # the slot that job leaves (a later day) is refilled the same way
+        freed = [day]
+        while freed:
+            day = heapq.heappop(freed)
+            while len(self._day_jobs.get(day, ())) < self.capacity:
+                job = self._most_urgent_late(day)
+                if job is None:
+                    break
+                heapq.heappush(freed, self._unassign(job))
+                self._assign(job, day)
+                moved.append(job)
+    
+    def update_prediction(self, equipment_id, predicted_failure_prob, days_to_failure, **fields):
+        """
+        Add or update one device's prediction and patch the schedule
+        
+        The device keeps its day while that still meets the new deadline;
+        otherwise it is re-placed, bumping less urgent jobs if needed.
+        
+        Parameters:
+        -----------
+        equipment_id : str
+            Device identifier
+        predicted_failure_prob : float
+            New failure probability
+        days_to_failure : int
+            New days to failure
+        **fields :
+            Other prediction columns to store (e.g. suggested_maintenance_date)
+            
+        Returns:
+        --------
+        list: equipment_ids whose scheduled day changed
+        """
+        if self.max_days_to_failure is None:
+            self.max_days_to_failure = max(int(days_to_failure), 1)
+        
+        record = self._jobs.get(equipment_id, {'equipment_id': equipment_id})
+        record.update(fields)
+        record['predicted_failure_prob'] = predicted_failure_prob
+        record['days_to_failure'] = days_to_failure
+        level = int(priority_levels(predicted_failure_prob))
+        record['priority'] = PRIORITY_CATEGORIES[level]
+        record['urgency_score'] = float(urgency_scores(predicted_failure_prob, days_to_failure,
+                                                       self.max_days_to_failure))
+        record['deadline'] = max(int(days_to_failure) - self.safety_margin_days, 0)
+        self._jobs[equipment_id] = record
+        
+        slot = self._slot_for(equipment_id)
+        self._urgency_arr[slot] = record['urgency_score']
+        self._level_arr[slot] = level
+        self._days_arr[slot] = days_to_failure
+        self._deadline_arr[slot] = record['deadline']
+        
+        moved = []
+        day = self._day.get(equipment_id)
+        if day is not None:
+            if day <= record['deadline']:
+                # Still in time: keep the slot, refresh the indexes
+                self._unassign(equipment_id)
+                self._assign(equipment_id, day)
+                return moved
+            self._unassign(equipment_id)
+        
+        self._insert(equipment_id, moved)
+        if self._day[equipment_id] != day:
+            moved.insert(0, equipment_id)
+            if day is not None:
+                self._backfill(day, moved)
+        return moved
+    
+    def remove(self, equipment_id):
+        """
+        Drop a device from the schedule
+        
+        Returns:
+        --------
+        list: equipment_ids moved into the freed slot
+        """
+        moved = []
+        day = self._unassign(equipment_id)
+        del self._jobs[equipment_id]
+        
+        slot = self._slots.pop(equipment_id)
+        self._urgency_arr[slot] = -np.inf
+        self._slot_ids[slot] = None
+        self._free_slots.append(slot)
+        
+        self._backfill(day, moved)
+        return moved
+    
+    def sync(self, predictions_df):
+        """
+        Patch the schedule to match a prediction table
+        
+        Only devices that are new, gone or whose probability or days to
+        failure changed are touched.
+        
+        Returns:
+        --------
+        list: equipment_ids whose scheduled day changed
+        """
+        moved = []
+        current = set()
+        for record in predictions_df.to_dict('records'):
+            equipment_id = record.pop('equipment_id')
+            current.add(equipment_id)
+            old = self._jobs.get(equipment_id)
+            if (old is not None and old['predicted_failure_prob'] == record['predicted_failure_prob']
+                    and old['days_to_failure'] == record['days_to_failure']):
+                continue
+            moved += self.update_prediction(equipment_id, **record)
+        for equipment_id in [job for job in self._jobs if job not in current]:
+            moved += self.remove(equipment_id)
+        return moved
+    
+    def rebuild(self):
+        """
+        Reschedule every job from scratch (same result as build())
+        """
+        if not self._jobs:
+            return self
+        records = list(self._jobs.values())
+        ids = [record['equipment_id'] for record in records]
+        deadlines = np.array([record['deadline'] for record in records], dtype=np.int64)
+        urgency = np.array([record['urgency_score'] for record in records], dtype=np.float64)
+        days = capacity_schedule(deadlines, urgency, self.capacity)
+        
+        self._reset_placement()
+        for equipment_id, day in zip(ids, days.tolist()):
+            self._assign(equipment_id, day)
+        return self
+    
+    def scheduled_day(self, equipment_id):
+        """
+        Days from start_date of a device's maintenance
+        """
+        return self._day[equipment_id]
+    
+    def jobs_on(self, day):
+        """
+        equipment_ids scheduled on a day (days from start_date)
+        """
+        return set(self._day_jobs.get(day, ()))
+    
+    @property
+    def late_jobs(self):
+        return set(self._late)
+    
+    def top_k_urgent(self, k=20, priority=None, max_days_to_failure=None, late=None):
+        """
+        The k most urgent jobs, without sorting or copying the schedule
+        
+        Parameters:
+        -----------
+        k : int
+            Number of jobs to return
+        priority : str or list of str (optional)
+            Only these priority levels
+        max_days_to_failure : int (optional)
+            Only jobs failing within this many days
+        late : bool (optional)
+            Only late (True) or only on-time (False) jobs
+            
+        Returns:
+        --------
+        DataFrame: Up to k schedule rows, most urgent first
+        """
+        n = len(self._slot_ids)
+        urgency = self._urgency_arr[:n]
+        
+        mask = None
+        if priority is not None:
+            levels = [PRIORITY_CATEGORIES.index(p) for p in np.atleast_1d(priority)]
+            mask = np.isin(self._level_arr[:n], levels)
+        if max_days_to_failure is not None:
+            within = self._days_arr[:n] <= max_days_to_failure
+            mask = within if mask is None else mask & within
+        if late is not None:
+            is_late = (self._day_arr[:n] > self._deadline_arr[:n]) == late
+            mask = is_late if mask is None else mask & is_late
+        
+        if mask is None:
+            slots = top_k_indices(urgency, k)
         else:
-            suggested = row.get('suggested_maintenance_date', current_date + timedelta(days=14))
-            if isinstance(suggested, str):
-                suggested = pd.to_datetime(suggested).date()
-            assigned_dates.append(suggested)
+            candidates = np.flatnonzero(mask)
+            slots = candidates[top_k_indices(urgency[candidates], k)]
+        # Free slots hold -inf and only show up when fewer than k jobs exist
+        slots = slots[np.isfinite(urgency[slots])]
         
-        # Check daily capacity
-        if daily_count >= max_daily_capacity:
-            current_date += timedelta(days=1)
-            daily_count = 0
+        rows = []
+        start = np.datetime64(self.start_date.date(), 'D')
+        for slot in slots.tolist():
+            record = dict(self._jobs[self._slot_ids[slot]])
+            deadline = record.pop('deadline')
+            day = self._day_arr[slot]
+            record['scheduled_maintenance_date'] = (start + day).astype(object)
+            record['late'] = bool(day > deadline)
+            rows.append(record)
+        if not rows:
+            return pd.DataFrame(columns=SCHEDULE_COLUMNS[:5] + ['scheduled_maintenance_date', 'late'])
+        return pd.DataFrame(rows)
     
-    schedule['scheduled_maintenance_date'] = assigned_dates
+    def to_frame(self):
+        """
+        Schedule as a DataFrame (same columns as assign_maintenance_dates)
+        
+        Returns:
+        --------
+        DataFrame: One row per device, most urgent first
+        """
+        if not self._jobs:
+            return pd.DataFrame(columns=SCHEDULE_COLUMNS)
+        schedule = pd.DataFrame(list(self._jobs.values()))
+        days = schedule['equipment_id'].map(self._day).to_numpy(np.int64)
+        deadlines = schedule.pop('deadline').to_numpy(np.int64)
+        start = np.datetime64(self.start_date.date(), 'D')
+        schedule['scheduled_maintenance_date'] = (start + days).astype(object)
+        schedule['deadline_date'] = (start + deadlines).astype(object)
+        schedule['late'] = days > deadlines
+        schedule['days_late'] = np.maximum(days - deadlines, 0)
+        return schedule.sort_values('urgency_score', ascending=False, kind='stable')
+
+
+def benchmark_incremental_update(n_jobs=100_000, n_updates=1000, max_daily_capacity=500, seed=42):
+    """
+    Time single-prediction updates against a full reschedule
     
-    return schedule
+    Returns:
+    --------
+    dict: Full rebuild seconds, mean update and remove milliseconds and jobs moved per update
+    """
+    rng = np.random.default_rng(seed)
+    predictions = pd.DataFrame({
+        'equipment_id': [f'EQ-{i:06d}' for i in range(n_jobs)],
+        'predicted_failure_prob': rng.random(n_jobs).round(3),
+        'days_to_failure': rng.integers(0, 126, n_jobs)
+    })
+    
+    start = time.perf_counter()
+    state = ScheduleState.build(predictions, max_daily_capacity=max_daily_capacity)
+    build_seconds = time.perf_counter() - start
+    
+    ids = rng.choice(predictions['equipment_id'].to_numpy(), n_updates)
+    probs = rng.random(n_updates).round(3)
+    days = rng.integers(0, 126, n_updates)
+    moved = 0
+    start = time.perf_counter()
+    for equipment_id, prob, days_left in zip(ids, probs, days):
+        moved += len(state.update_prediction(equipment_id, float(prob), int(days_left)))
+    update_seconds = time.perf_counter() - start
+    
+    removed = rng.choice(predictions['equipment_id'].to_numpy(), n_updates, replace=False)
+    start = time.perf_counter()
+    for equipment_id in removed:
+        state.remove(equipment_id)
+    remove_seconds = time.perf_counter() - start
+    
+    return {
+        'jobs': n_jobs,
+        'full_build_seconds': build_seconds,
+        'update_ms': update_seconds / n_updates * 1000,
+        'remove_ms': remove_seconds / n_updates * 1000,
+        'moved_per_update': moved / n_updates
+    }
 
 
-def generate_maintenance_summary(schedule_df):
+def benchmark_top_k(n_jobs=1_000_000, k=50, seed=42):
+    """
+    Time a top-k urgency query against scoring and sorting the whole fleet
+    
+    Returns:
+    --------
+    dict: Milliseconds for the full sort and for the partial selection
+    """
+    rng = np.random.default_rng(seed)
+    predictions = pd.DataFrame({
+        'equipment_id': [f'EQ-{i:07d}' for i in range(n_jobs)],
+        'predicted_failure_prob': rng.random(n_jobs).round(3),
+        'days_to_failure': rng.integers(0, 126, n_jobs)
+    })
+    
+    start = time.perf_counter()
+    create_maintenance_schedule(predictions).head(k)
+    sort_ms = (time.perf_counter() - start) * 1000
+    
+    # Partial selection over a maintained urgency array (as in ScheduleState)
+    urgency = urgency_scores(predictions['predicted_failure_prob'], predictions['days_to_failure'], 125)
+    start = time.perf_counter()
+    top = top_k_indices(urgency, k)
+    top_k_ms = (time.perf_counter() - start) * 1000
+    
+    assert np.allclose(urgency[top], np.sort(urgency)[::-1][:k])
+    return {'jobs': n_jobs, 'k': k, 'full_sort_ms': sort_ms, 'top_k_ms': top_k_ms}
+
+
+def generate_maintenance_summary(schedule_df, calendar=None):
     """
     Generate maintenance schedule summary
     
@@ -99,21 +1008,35 @@ def generate_maintenance_summary(schedule_df):
     -----------
     schedule_df : DataFrame
         Complete maintenance schedule
+    calendar : CalendarIndex (optional)
+        Index of the same schedule (e.g. ScheduleState.calendar);
+        built from schedule_df when not given
         
     Returns:
     --------
     dict: Summary statistics
     """
+    if calendar is None and 'scheduled_maintenance_date' in schedule_df.columns:
+        calendar = CalendarIndex.from_schedule(schedule_df)
+    
+    if calendar is not None:
+        priority_counts = calendar.counts.sum(axis=0)
+        today = datetime.today()
+        windows = {f'next_{days}_days': calendar.count(end=today + timedelta(days=days))
+                   for days in (7, 14, 30)}
+    else:
+        levels = pd.Categorical(schedule_df['priority'], categories=PRIORITY_CATEGORIES).codes
+        priority_counts = np.bincount(levels[levels >= 0], minlength=len(PRIORITY_CATEGORIES))
+        windows = {f'next_{days}_days': 0 for days in (7, 14, 30)}
+    
     summary = {
         'total_equipment': len(schedule_df),
-        'high_priority': len(schedule_df[schedule_df['priority'] == 'High']),
-        'medium_priority': len(schedule_df[schedule_df['priority'] == 'Medium']),
-        'low_priority': len(schedule_df[schedule_df['priority'] == 'Low']),
+        'high_priority': int(priority_counts[2]),
+        'medium_priority': int(priority_counts[1]),
+        'low_priority': int(priority_counts[0]),
         'avg_failure_prob': schedule_df['predicted_failure_prob'].mean(),
-        'next_7_days': len(schedule_df[
-            pd.to_datetime(schedule_df['scheduled_maintenance_date']) <= 
-            datetime.today() + timedelta(days=7)
-        ]) if 'scheduled_maintenance_date' in schedule_df.columns else 0
+        **windows,
+        'late_jobs': int(schedule_df['late'].sum()) if 'late' in schedule_df.columns else 0
     }
     
     return summary
@@ -131,7 +1054,26 @@ if __name__ == "__main__":
     schedule = assign_maintenance_dates(schedule)
     
     print("Maintenance Schedule:")
-    print(schedule[['equipment_id', 'priority', 'scheduled_maintenance_date']])
+    print(schedule[['equipment_id', 'priority', 'scheduled_maintenance_date', 'late']])
     
     summary = generate_maintenance_summary(schedule)
     print(f"\nSummary: {summary}")
+    
+    print(f"\nBenchmark: {benchmark_capacity_scheduler()}")
+    
+    # Patch the schedule when one prediction changes
+    state = ScheduleState.build(sample_predictions, max_daily_capacity=1)
+    moved = state.update_prediction('EQ-03', 0.95, 1)
+    print(f"\nEQ-03 now critical, moved: {moved}")
+    print(state.to_frame()[['equipment_id', 'priority', 'scheduled_maintenance_date', 'late']])
+    
+    for n_jobs in [10_000, 100_000]:
+        print(f"\nIncremental update: {benchmark_incremental_update(n_jobs)}")
+    
+    print("\nNext jobs for the dispatcher:")
+    print(state.top_k_urgent(2)[['equipment_id', 'urgency_score', 'scheduled_maintenance_date']])
+    print(f"\nTop-k query: {benchmark_top_k()}")
+    
+    calendar = state.calendar
+    print(f"\nJobs in the next 2 days: {calendar.count(end=2)}, High priority: {calendar.count(end=2, priority='High')}")
+    print(f"Weekly load (next 2 weeks): {calendar.histogram(7, n_buckets=2)}")
@@ -0,0 +1,196 @@
+"""
+Model Manager Module
+"""
+
+import joblib
+import threading
+import os
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODEL_PATH = os.path.join(PROJECT_ROOT, 'models', 'machine_failure_model.pkl')
+SCALER_PATH = os.path.join(PROJECT_ROOT, 'models', 'scaler.pkl')
+FOREST_PATH = os.path.join(PROJECT_ROOT, 'models', 'machine_failure_model.forest.npz')
+PIPELINE_PATH = os.path.join(PROJECT_ROOT, 'models', 'feature_pipeline.pkl')
+SCREEN_MODEL_PATH = os.path.join(PROJECT_ROOT, 'models', 'screen_model.pkl')
+DRIFT_REFERENCE_PATH = os.path.join(PROJECT_ROOT, 'models', 'drift_reference.npz')
+
+# Set to 'r' to memory-map the model arrays (shared between worker processes)
+MMAP_MODE_ENV = 'MEP_MODEL_MMAP_MODE'
+
+
+class ModelManager:
+    """
+    Load trained artifacts on first use and share them process-wide
+
+    Parameters:
+    -----------
+    model_path : str
+        Path to the pickled classifier
+    scaler_path : str
+        Path to the pickled StandardScaler
+    forest_path : str
+        Path to the exported CompiledForest arrays (see forest_engine)
+    pipeline_path : str
+        Path to the saved FeaturePipeline (see feature_pipeline)
+    screen_model_path : str
+        Path to the cheap first-tier model used by cascade prediction
+    mmap_mode : str (optional)
+        joblib mmap_mode ('r', 'r+', 'c'). Large numpy arrays of the model
+        are then memory-mapped, so several processes share one physical copy.
+    """
+
+    def __init__(self, model_path=MODEL_PATH, scaler_path=SCALER_PATH,
+                 forest_path=FOREST_PATH, pipeline_path=PIPELINE_PATH,
+                 screen_model_path=SCREEN_MODEL_PATH, mmap_mode=None):
+        self.model_path = model_path
+        self.scaler_path = scaler_path
+        self.forest_path = forest_path
+        self.pipeline_path = pipeline_path
+        self.screen_model_path = screen_model_path
+        self.mmap_mode = mmap_mode
+        self._artifacts = {}
+        self._lock = threading.RLock()
+
+    def _get(self, name, loader):
+        if name not in self._artifacts:
+            with self._lock:
+                # Another thread may have loaded it while we were waiting
+                if name not in self._artifacts:
+                    # Remember which files the loaded artifacts came from
+                    self._artifacts.setdefault('signature', self.artifact_signature())
+                    self._artifacts[name] = loader()
+        return self._artifacts[name]
+
+    def _load_forest(self):
+        from src.forest_engine import CompiledForest, compile_forest
+
+        # A current export skips unpickling the sklearn model entirely
+        if os.path.exists(self.forest_path) and (
+                not os.path.exists(self.model_path) or
+                os.path.getmtime(self.forest_path) >= os.path.getmtime(self.model_path)):
+            return CompiledForest.load(self.forest_path)
+
+        if hasattr(self.model, 'estimators_') and hasattr(self.model, 'predict_proba'):
+            return compile_forest(self.model)
+        return None
+
+    def _load_pipeline(self):
+        from src.feature_pipeline import FeaturePipeline
+
+        # A saved pipeline wins; otherwise wrap the plain scaler.pkl
+        if os.path.exists(self.pipeline_path):
+            return FeaturePipeline.load(self.pipeline_path)
+        return FeaturePipeline.from_scaler(self.scaler)
+
+    @property
+    def model(self):
+        return self._get('model', lambda: joblib.load(self.model_path, mmap_mode=self.mmap_mode))
+
+    @property
+    def scaler(self):
+        return self._get('scaler', lambda: joblib.load(self.scaler_path, mmap_mode=self.mmap_mode))
+
+    @property
+    def screen_model(self):
+        return self._get('screen_model', lambda: joblib.load(self.screen_model_path))
+
+    @property
+    def forest(self):
+        """
+        CompiledForest for the model, or None if it is not a tree ensemble
+        """
+        return self._get('forest', self._load_forest)
+
+    @property
+    def pipeline(self):
+        """
+        FeaturePipeline turning raw readings into scaled model input
+        """
+        return self._get('pipeline', self._load_pipeline)
+
+    def is_loaded(self, name):
+        return name in self._artifacts
+
+    def artifact_signature(self):
+        """
+        (path, mtime, size) of each artifact file; changes when a file is replaced
+        """
+        signature = []
+        for path in (self.model_path, self.scaler_path, self.forest_path,
+                     self.pipeline_path, self.screen_model_path):
+            try:
+                stat = os.stat(path)
+                signature.append((path, stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                signature.append((path, None, None))
+        return tuple(signature)
+
+    def refresh_if_changed(self):
+        """
+        Drop loaded artifacts if any file changed since they were loaded
+
+        Returns:
+        --------
+        tuple: Current artifact signature
+        """
+        signature = self.artifact_signature()
+        with self._lock:
+            if self._artifacts.get('signature', signature) != signature:
+                self._artifacts.clear()
+        return signature
+
+    def clear(self):
+        """
+        Drop loaded artifacts; they are reloaded on next access
+        """
+        with self._lock:
+            self._artifacts.clear()
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_model_manager():
+    """
+    Get the process-wide model manager (created on first call)
+
+    Returns:
+    --------
+    ModelManager: Shared manager instance
+    """
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = ModelManager(mmap_mode=os.environ.get(MMAP_MODE_ENV) or None)
+    return _manager
+
+
+def configure_models(model_path=MODEL_PATH, scaler_path=SCALER_PATH,
+                     forest_path=FOREST_PATH, pipeline_path=PIPELINE_PATH,
+                     screen_model_path=SCREEN_MODEL_PATH, mmap_mode=None):
+    """
+    Replace the process-wide model manager
+
+    Call before the first prediction (e.g. at the start of a CLI script
+    or a worker process) to point at other artifacts or enable mmap.
+
+    Returns:
+    --------
+    ModelManager: New shared manager instance
+    """
+    global _manager
+    with _manager_lock:
+        _manager = ModelManager(model_path, scaler_path, forest_path, pipeline_path,
+                                screen_model_path, mmap_mode=mmap_mode)
+    return _manager
+
+
+if __name__ == "__main__":
+    # Example usage
+    manager = get_model_manager()
+    print(f"Model loaded: {manager.is_loaded('model')}")
+    print(f"Model: {type(manager.model).__name__}")
+    print(f"Scaler: {type(manager.scaler).__name__}")
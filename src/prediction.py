@@ -2,21 +2,222 @@
 Equipment Failure Prediction Module
 """
 
-import joblib
 import pandas as pd
 import numpy as np
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
+import argparse
+import threading
+import time
 import os
 
+from src.model_manager import get_model_manager, configure_models
+from src.data_preprocessing import iter_data_chunks, encode_equipment_type
+from src.feature_pipeline import INTERACTION_COLUMNS
+from src.drift_monitor import DriftMonitor, DriftReference
+
 # Get project root directory
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-# Load model and scaler
-MODEL_PATH = os.path.join(PROJECT_ROOT, 'models', 'machine_failure_model.pkl')
-SCALER_PATH = os.path.join(PROJECT_ROOT, 'models', 'scaler.pkl')
+# Above this many rows sklearn's compiled tree traversal is faster
+COMPILED_FOREST_MAX_ROWS = 1024
+
+# Status labels by predicted class (0, 1)
+STATUS_CATEGORIES = ['No Failure', 'Failure']
+
+# Screen probabilities inside this band are re-scored by the forest
+DEFAULT_CASCADE_BAND = (0.1, 0.99)
+
+RESULT_COLUMNS = [
+    'equipment_id', 'predicted_failure_prob', 'days_to_failure',
+    'last_maintenance', 'suggested_maintenance_date', 'status'
+]
+
+# Readings closer than these steps share a cached prediction (model-input
+# columns without a step, e.g. trend features, are keyed on their exact value)
+DEFAULT_CACHE_RESOLUTIONS = {
+    'Air temperature [K]': 0.1,
+    'Process temperature [K]': 0.1,
+    'Rotational speed [rpm]': 1,
+    'Torque [Nm]': 0.1,
+    'Tool wear [min]': 1,
+    'Type_L': 1,
+    'Type_M': 1
+}
+
+
+def __getattr__(name):
+    # Model and scaler are loaded on first use by the shared manager
+    if name == 'model':
+        return get_model_manager().model
+    if name == 'scaler':
+        return get_model_manager().scaler
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class PredictionCache:
+    """
+    Bounded LRU cache of model outputs keyed on the quantized model input
+
+    Parameters:
+    -----------
+    maxsize : int
+        Maximum number of cached feature vectors
+    resolutions : dict (optional)
+        Quantization step per input feature (see DEFAULT_CACHE_RESOLUTIONS)
+    check_interval : float
+        Seconds between checks for changed model/scaler files
+    """
 
-model = joblib.load(MODEL_PATH)
-scaler = joblib.load(SCALER_PATH)
+    def __init__(self, maxsize=10000, resolutions=None, check_interval=1.0):
+        self.maxsize = maxsize
+        self.resolutions = dict(DEFAULT_CACHE_RESOLUTIONS)
+        if resolutions:
+            self.resolutions.update(resolutions)
+        self.check_interval = check_interval
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._signature = None
+        self._next_check = 0.0
+
+    def make_key(self, features, feature_columns):
+        """
+        Cache key of an encoded, unscaled model-input row (FeaturePipeline.raw_record)
+
+        Interaction columns are left out: they follow from the sensors.
+        """
+        return tuple(
+            int(round(value / self.resolutions[column])) if column in self.resolutions else float(value)
+            for column, value in zip(feature_columns, features)
+            if column not in INTERACTION_COLUMNS
+        )
+
+    def _check_artifacts(self):
+        # Throttled so a cache hit stays a dictionary lookup
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        self._next_check = now + self.check_interval
+
+        signature = get_model_manager().refresh_if_changed()
+        if signature != self._signature:
+            self._entries.clear()
+            self._signature = signature
+
+    def get(self, key):
+        with self._lock:
+            self._check_artifacts()
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Cache counters
+
+        Returns:
+        --------
+        dict: size, maxsize, hits, misses and hit_rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+
+_prediction_cache = None
+
+
+def enable_prediction_cache(maxsize=10000, resolutions=None, check_interval=1.0):
+    """
+    Turn on the prediction cache used by predict_equipment_failure
+
+    Returns:
+    --------
+    PredictionCache: The active cache
+    """
+    global _prediction_cache
+    _prediction_cache = PredictionCache(maxsize, resolutions, check_interval)
+    return _prediction_cache
+
+
+def disable_prediction_cache():
+    global _prediction_cache
+    _prediction_cache = None
+
+
+def get_prediction_cache():
+    """
+    Active PredictionCache, or None when caching is disabled
+    """
+    return _prediction_cache
+
+
+_drift_monitor = None
+
+
+def enable_drift_monitor(reference=None):
+    """
+    Track the distribution of every batch scored by predict_batch,
+    cascade_predict, stream_predict and parallel_predict
+
+    Parameters:
+    -----------
+    reference : DriftReference (optional)
+        Training distribution (default: models/drift_reference.npz)
+
+    Returns:
+    --------
+    DriftMonitor: The active monitor (see DriftMonitor.scores)
+    """
+    global _drift_monitor
+    _drift_monitor = DriftMonitor(reference if reference is not None else DriftReference.load())
+    return _drift_monitor
+
+
+def disable_drift_monitor():
+    global _drift_monitor
+    _drift_monitor = None
+
+
+def get_drift_monitor():
+    """
+    Active DriftMonitor, or None when monitoring is disabled
+    """
+    return _drift_monitor
+
+
+def _predict_single(equipment_data):
+    """
+    Failure probability and class for one equipment dict
+    """
+    input_scaled = get_model_manager().pipeline.transform_record(equipment_data)
+    pred_prob, pred_class = _predict_proba(input_scaled)
+    return pred_prob[0], pred_class[0]
 
 
 def predict_equipment_failure(equipment_data):
@@ -39,21 +240,22 @@ def predict_equipment_failure(equipment_data):
     --------
     dict: Prediction results
     """
-    input_df = pd.DataFrame([equipment_data])
-    equipment_id = input_df['equipment_id'][0]
-    input_features = input_df.drop(columns=['equipment_id'])
+    equipment_id = equipment_data['equipment_id']
     
-    # Feature Engineering - Add interaction features
-    input_features['Temp_Diff'] = input_features['Process temperature [K]'] - input_features['Air temperature [K]']
-    input_features['Power'] = input_features['Torque [Nm]'] * input_features['Rotational speed [rpm]'] / 9550  # Power in kW
-    input_features['Torque_Tool_Interaction'] = input_features['Torque [Nm]'] * input_features['Tool wear [min]']
-    
-    # Scaling
-    input_scaled = scaler.transform(input_features)
-    
-    # Prediction
-    pred_class = model.predict(input_scaled)[0]
-    pred_prob = model.predict_proba(input_scaled)[0][1]
+    cache = _prediction_cache
+    if cache is None:
+        pred_prob, pred_class = _predict_single(equipment_data)
+    else:
+        # Encode once: the same row gives the key and, on a miss, the model input
+        pipeline = get_model_manager().pipeline
+        features = pipeline.raw_record(equipment_data)
+        key = cache.make_key(features, pipeline.feature_columns)
+        cached = cache.get(key)
+        if cached is None:
+            pred_prob, pred_class = _predict_proba(pipeline.transform_matrix(features[None, :]))
+            cached = (pred_prob[0], pred_class[0])
+            cache.put(key, cached)
+        pred_prob, pred_class = cached
     
     failure_label = 'Failure' if pred_class == 1 else 'No Failure'
     
@@ -72,6 +274,198 @@ def predict_equipment_failure(equipment_data):
     }
 
 
+def _predict_proba(input_scaled):
+    """
+    Failure probability and class for scaled model input
+
+    Small batches of a tree ensemble run on the compiled array-backed
+    forest (see forest_engine), which avoids sklearn's per-call overhead.
+    Large batches and other models use the sklearn estimator.
+
+    Returns:
+    --------
+    (ndarray, ndarray): Failure probability and predicted class per row
+    """
+    models = get_model_manager()
+    estimator = models.forest
+    if estimator is None or (len(input_scaled) > COMPILED_FOREST_MAX_ROWS and
+                             os.path.exists(models.model_path)):
+        estimator = models.model
+
+    proba = estimator.predict_proba(input_scaled)
+    pred_class = estimator.classes_[np.argmax(proba, axis=1)]
+    pred_prob = proba[:, list(estimator.classes_).index(1)]
+
+    return pred_prob, pred_class
+
+
+def _engineer_feature_matrix(data, dtype=np.float64):
+    """
+    Build the scaled model input for a whole batch in one pass
+
+    Parameters:
+    -----------
+    data : DataFrame or dict of array-like
+        Columnar equipment features (same keys as predict_equipment_failure)
+    dtype : numpy dtype
+        Feature matrix dtype (float32 in compact mode)
+
+    Returns:
+    --------
+    ndarray: Scaled feature matrix (n_equipment, n_features)
+    """
+    input_scaled = get_model_manager().pipeline.transform(data, dtype=dtype)
+    monitor = _drift_monitor
+    if monitor is not None:
+        monitor.update(input_scaled)
+    return input_scaled
+
+
+def predict_batch(data, compact=False):
+    """
+    Vectorized failure prediction for a whole fleet
+
+    Feature engineering, scaling and the model call run once for the
+    whole batch instead of once per equipment.
+
+    Parameters:
+    -----------
+    data : DataFrame or dict of array-like
+        Columnar equipment data with equipment_id and the features
+        listed in predict_equipment_failure
+    compact : bool
+        Return compact columns (see _results_frame)
+
+    Returns:
+    --------
+    DataFrame: Batch prediction results (same columns as batch_predict)
+    """
+    if len(data['equipment_id']) == 0:
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+
+    input_scaled = _engineer_feature_matrix(data, np.float32 if compact else np.float64)
+
+    # A single predict_proba call; the class is derived from it
+    pred_prob, pred_class = _predict_proba(input_scaled)
+
+    return _results_frame(data, pred_prob, pred_class, compact)
+
+
+def _results_frame(data, pred_prob, pred_class, compact=False):
+    """
+    Assemble the prediction result columns for a batch
+
+    In compact mode probabilities are float32, days int16, status a
+    categorical and the dates datetime64 columns instead of Python
+    date objects.
+    """
+    # Estimate remaining days
+    MAX_TOOL_WEAR = 250
+    tool_wear = np.asarray(data['Tool wear [min]'], dtype=float)
+    remaining_days = np.maximum(0, np.trunc((MAX_TOOL_WEAR - tool_wear) * 0.5)).astype(int)
+
+    today = np.datetime64(datetime.today().date(), 'D')
+    suggested_dates = today + np.maximum(remaining_days - 7, 0).astype('timedelta64[D]')
+
+    n = len(remaining_days)
+    if compact:
+        return pd.DataFrame({
+            'equipment_id': np.asarray(data['equipment_id']),
+            'predicted_failure_prob': np.round(pred_prob, 3).astype(np.float32),
+            'days_to_failure': remaining_days.astype(np.int16),
+            'last_maintenance': np.full(n, today),
+            'suggested_maintenance_date': suggested_dates,
+            'status': pd.Categorical.from_codes(
+                (pred_class == 1).astype(np.int8), categories=STATUS_CATEGORIES
+            )
+        })
+
+    return pd.DataFrame({
+        'equipment_id': np.asarray(data['equipment_id']),
+        'predicted_failure_prob': np.round(pred_prob, 3),
+        'days_to_failure': remaining_days,
+        'last_maintenance': np.full(n, today).astype(object),
+        'suggested_maintenance_date': suggested_dates.astype(object),
+        'status': np.where(pred_class == 1, 'Failure', 'No Failure')
+    })
+
+
+def _screen_proba(input_scaled):
+    """
+    Failure probability from the linear screening model
+    """
+    screen = get_model_manager().screen_model
+    if hasattr(screen, 'coef_') and len(screen.classes_) == 2:
+        # Logistic regression is a dot product and a sigmoid
+        logits = input_scaled @ screen.coef_[0] + screen.intercept_[0]
+        positive = 1.0 / (1.0 + np.exp(-logits))
+        return positive if screen.classes_[1] == 1 else 1.0 - positive
+    proba = screen.predict_proba(input_scaled)
+    return proba[:, list(screen.classes_).index(1)]
+
+
+def cascade_predict(data, uncertainty_band=DEFAULT_CASCADE_BAND, evaluate=False, y_true=None,
+                    compact=False):
+    """
+    Two-tier prediction: a cheap linear screen first, the forest only when uncertain
+    
+    Every row is scored by the screening model (models/screen_model.pkl).
+    Rows whose screen probability falls inside uncertainty_band are
+    re-scored by the forest; the rest keep the screen result.
+    
+    Parameters:
+    -----------
+    data : DataFrame or dict of array-like
+        Columnar equipment data (same as predict_batch)
+    uncertainty_band : (float, float)
+        Screen probabilities in [low, high] are routed to the forest
+    evaluate : bool
+        Also score every row with the forest and report the delta
+        against forest-only prediction (costs a full forest pass)
+    y_true : array-like (optional)
+        Known labels; adds cascade vs forest-only accuracy to the report
+    compact : bool
+        float32 features and compact result columns (see predict_batch)
+        
+    Returns:
+    --------
+    (DataFrame, dict): Batch prediction results and routing report
+    """
+    n = len(data['equipment_id'])
+    if n == 0:
+        return pd.DataFrame(columns=RESULT_COLUMNS), {'rows': 0}
+
+    low, high = uncertainty_band
+    input_scaled = _engineer_feature_matrix(data, np.float32 if compact else np.float64)
+
+    pred_prob = _screen_proba(input_scaled)
+    pred_class = (pred_prob >= 0.5).astype(int)
+
+    uncertain = (pred_prob >= low) & (pred_prob <= high)
+    if uncertain.any():
+        forest_prob, forest_class = _predict_proba(input_scaled[uncertain])
+        pred_prob[uncertain] = forest_prob
+        pred_class[uncertain] = forest_class
+
+    report = {
+        'rows': n,
+        'screen_fraction': float(1.0 - uncertain.mean()),
+        'forest_fraction': float(uncertain.mean())
+    }
+
+    if evaluate or y_true is not None:
+        full_prob, full_class = _predict_proba(input_scaled)
+        report['class_agreement'] = float(np.mean(pred_class == full_class))
+        report['max_abs_prob_delta'] = float(np.max(np.abs(pred_prob - full_prob)))
+        if y_true is not None:
+            y_true = np.asarray(y_true)
+            report['cascade_accuracy'] = float(np.mean(pred_class == y_true))
+            report['forest_accuracy'] = float(np.mean(full_class == y_true))
+            report['accuracy_delta'] = report['cascade_accuracy'] - report['forest_accuracy']
+
+    return _results_frame(data, pred_prob, pred_class, compact), report
+
+
 def batch_predict(equipment_list):
     """
     Predict for multiple equipment
@@ -85,15 +479,267 @@ def batch_predict(equipment_list):
     --------
     DataFrame: Batch prediction results
     """
-    results = []
-    for equipment in equipment_list:
-        result = predict_equipment_failure(equipment)
-        results.append(result)
+    if len(equipment_list) == 0:
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+
+    return predict_batch(pd.DataFrame(equipment_list))
+
+
+def _equipment_records(chunks):
+    """
+    Add equipment_id and Type_L/Type_M to raw dataset chunks
+    """
+    for chunk in chunks:
+        if 'Type_L' not in chunk.columns:
+            chunk = encode_equipment_type(chunk)
+        if 'equipment_id' not in chunk.columns:
+            chunk = chunk.rename(columns={'Product ID': 'equipment_id'})
+        yield chunk
+
+
+class _ResultWriter:
+    """
+    Append result frames to a CSV or Parquet file in order
+    """
+
+    def __init__(self, output_path, output_format=None):
+        if output_format is None:
+            output_format = 'parquet' if output_path.endswith('.parquet') else 'csv'
+        if output_format not in ('csv', 'parquet'):
+            raise ValueError(f"Unsupported output format: {output_format}")
+        
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        self.output_path = output_path
+        self.output_format = output_format
+        self.rows = 0
+        self._started = False
+        self._parquet_writer = None
+
+    def write(self, result):
+        if self.output_format == 'csv':
+            result.to_csv(self.output_path, mode='a' if self._started else 'w',
+                          header=not self._started, index=False)
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            
+            table = pa.Table.from_pandas(result, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.output_path, table.schema)
+            self._parquet_writer.write_table(table)
+        self._started = True
+        self.rows += len(result)
+
+    def close(self):
+        # An empty input still produces a file with the result columns
+        if not self._started:
+            self.write(pd.DataFrame(columns=RESULT_COLUMNS))
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+
+def _write_results(results, output_path, output_format, verbose):
+    """
+    Drain an iterator of result frames into output_path, reporting rows/sec
+    """
+    if output_path is None:
+        output_path = os.path.join(PROJECT_ROOT, 'outputs', 'model_output.csv')
+    
+    writer = _ResultWriter(output_path, output_format)
+    start = time.perf_counter()
+    try:
+        for result in results:
+            writer.write(result)
+            
+            if verbose:
+                elapsed = time.perf_counter() - start
+                print(f"Scored {writer.rows:,} rows ({writer.rows / elapsed:,.0f} rows/sec)")
+    finally:
+        writer.close()
     
-    return pd.DataFrame(results)
+    elapsed = time.perf_counter() - start
+    return {
+        'rows': writer.rows,
+        'seconds': elapsed,
+        'rows_per_sec': writer.rows / elapsed if elapsed > 0 else 0.0,
+        'output_path': output_path
+    }
 
 
-if __name__ == "__main__":
+def stream_predict(input_path, output_path=None, chunksize=100_000, verbose=True,
+                   output_format=None):
+    """
+    Score an arbitrarily large sensor CSV chunk by chunk
+    
+    Each chunk flows through parse -> Type encoding -> feature engineering
+    and scaling -> prediction -> append to output, so memory stays flat
+    regardless of file size.
+    
+    Parameters:
+    -----------
+    input_path : str
+        CSV with the ai4i2020.csv schema (Product ID or equipment_id,
+        Type or Type_L/Type_M, sensor columns)
+    output_path : str (optional)
+        Output CSV or Parquet file (default: outputs/model_output.csv)
+    chunksize : int
+        Rows per chunk
+    verbose : bool
+        Print rows/sec after every chunk
+    output_format : str (optional)
+        'csv' or 'parquet' (default: from the output file extension)
+        
+    Returns:
+    --------
+    dict: Rows scored, elapsed seconds and rows/sec
+    """
+    records = _equipment_records(iter_data_chunks(input_path, chunksize))
+    results = (predict_batch(chunk) for chunk in records)
+    
+    return _write_results(results, output_path, output_format, verbose)
+
+
+def _init_score_worker(model_paths, mmap_mode, drift_reference=None):
+    # Load the artifacts once per worker process, not once per shard
+    models = configure_models(**model_paths, mmap_mode=mmap_mode)
+    models.model
+    models.pipeline
+    models.forest
+    if drift_reference is not None:
+        enable_drift_monitor(drift_reference)
+
+
+def _score_shard(shard, cascade=False):
+    result = cascade_predict(shard)[0] if cascade else predict_batch(shard)
+    # The shard's histogram goes back with the result and is merged by the parent
+    monitor = _drift_monitor
+    return result, monitor.drain() if monitor is not None else None
+
+
+def _merge_drift(scored, monitor):
+    for result, sketch in scored:
+        if monitor is not None and sketch is not None:
+            monitor.merge(sketch)
+        yield result
+
+
+def _ordered_pool_results(pool, shards, max_pending, cascade=False):
+    """
+    Submit shards to the pool and yield results in input order
+
+    At most max_pending shards are in flight, so the input is never
+    fully read into memory.
+    """
+    pending = deque()
+    for shard in shards:
+        pending.append(pool.submit(_score_shard, shard, cascade))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def parallel_predict(input_path, output_path=None, workers=None, shard_size=50_000,
+                     output_format=None, verbose=True, cascade=False):
+    """
+    Score a sensor CSV across a pool of worker processes
+    
+    The input is split into shards of shard_size rows. Each worker loads
+    the model once; results are merged in input order.
+    
+    Parameters:
+    -----------
+    input_path : str
+        CSV with the ai4i2020.csv schema
+    output_path : str (optional)
+        Output CSV or Parquet file (default: outputs/model_output.csv)
+    workers : int (optional)
+        Worker processes (default: number of CPUs)
+    shard_size : int
+        Rows per shard
+    output_format : str (optional)
+        'csv' or 'parquet' (default: from the output file extension)
+    verbose : bool
+        Print rows/sec after every shard
+    cascade : bool
+        Score with cascade_predict (linear screen, forest only when uncertain)
+        
+    Returns:
+    --------
+    dict: Rows scored, elapsed seconds and rows/sec
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    
+    shards = _equipment_records(iter_data_chunks(input_path, shard_size))
+    monitor = _drift_monitor
+    
+    if workers <= 1:
+        results = _merge_drift((_score_shard(shard, cascade) for shard in shards), monitor)
+        return _write_results(results, output_path, output_format, verbose)
+    
+    models = get_model_manager()
+    model_paths = {
+        'model_path': models.model_path,
+        'scaler_path': models.scaler_path,
+        'forest_path': models.forest_path,
+        'pipeline_path': models.pipeline_path,
+        'screen_model_path': models.screen_model_path
+    }
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_score_worker,
+        initargs=(model_paths, models.mmap_mode, monitor.reference if monitor is not None else None)
+    ) as pool:
+        scored = _ordered_pool_results(pool, shards, max_pending=2 * workers, cascade=cascade)
+        results = _merge_drift(scored, monitor)
+        return _write_results(results, output_path, output_format, verbose)
+
+
+def benchmark_compact_memory(n_rows=200_000, data_path=None):
+    """
+    Compare result memory of the default and compact modes
+    
+    The ai4i2020.csv rows are tiled up to n_rows equipment.
+    
+    Returns:
+    --------
+    dict: Deep memory usage (MB) of each result representation
+    """
+    from src.data_preprocessing import load_data
+    
+    source = encode_equipment_type(load_data(data_path))
+    fleet = source.iloc[np.arange(n_rows) % len(source)].reset_index(drop=True)
+    fleet['equipment_id'] = [f'EQ-{i:07d}' for i in range(n_rows)]
+    
+    default = predict_batch(fleet)
+    compact = predict_batch(fleet, compact=True)
+    records = default.to_dict(orient='records')
+    
+    def _deep_size(obj, seen):
+        import sys
+        if id(obj) in seen:
+            return 0
+        seen.add(id(obj))
+        size = sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            size += sum(_deep_size(k, seen) + _deep_size(v, seen) for k, v in obj.items())
+        elif isinstance(obj, list):
+            size += sum(_deep_size(item, seen) for item in obj)
+        return size
+    
+    mb = 1024 ** 2
+    return {
+        'rows': n_rows,
+        'list_of_dicts_mb': _deep_size(records, set()) / mb,
+        'default_frame_mb': default.memory_usage(deep=True).sum() / mb,
+        'compact_frame_mb': compact.memory_usage(deep=True).sum() / mb,
+        'compact_frame_without_ids_mb': compact.drop(columns='equipment_id').memory_usage(deep=True).sum() / mb,
+        'default_frame_without_ids_mb': default.drop(columns='equipment_id').memory_usage(deep=True).sum() / mb
+    }
+
+
+def _example():
     # Example usage
     sample_data = {
         'equipment_id': 'EQ-01',
@@ -109,3 +755,43 @@ if __name__ == "__main__":
     result = predict_equipment_failure(sample_data)
     print("Prediction Result:")
     print(result)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Equipment failure prediction")
+    subparsers = parser.add_subparsers(dest='command')
+    
+    score = subparsers.add_parser('score', help="Bulk-score a sensor CSV file")
+    score.add_argument('input', help="CSV with the ai4i2020.csv schema")
+    score.add_argument('--output', default=None,
+                       help="Output file (default: outputs/model_output.csv)")
+    score.add_argument('--format', dest='output_format', choices=['csv', 'parquet'], default=None,
+                       help="Output format (default: from the output extension)")
+    score.add_argument('--workers', type=int, default=None,
+                       help="Worker processes (default: number of CPUs)")
+    score.add_argument('--shard-size', type=int, default=50_000, help="Rows per shard")
+    score.add_argument('--cascade', action='store_true',
+                       help="Screen with the linear model; use the forest only when uncertain")
+    score.add_argument('--drift', action='store_true',
+                       help="Report input drift against models/drift_reference.npz")
+    score.add_argument('--quiet', action='store_true', help="Do not print progress")
+    
+    args = parser.parse_args(argv)
+    
+    if args.command == 'score':
+        monitor = enable_drift_monitor() if args.drift else None
+        summary = parallel_predict(
+            args.input, args.output, workers=args.workers, shard_size=args.shard_size,
+            output_format=args.output_format, verbose=not args.quiet, cascade=args.cascade
+        )
+        print(f"✅ {summary['rows']:,} predictions saved to: {summary['output_path']} "
+              f"({summary['rows_per_sec']:,.0f} rows/sec)")
+        if monitor is not None:
+            print("\n📉 Input drift vs training data:")
+            print(monitor.scores().to_string(index=False))
+    else:
+        _example()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+"""
+Local Scoring Server Module
+"""
+
+import asyncio
+import argparse
+import json
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from src.prediction import predict_batch, enable_drift_monitor, get_drift_monitor
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+REQUIRED_FIELDS = [
+    'equipment_id', 'Air temperature [K]', 'Process temperature [K]',
+    'Rotational speed [rpm]', 'Torque [Nm]', 'Tool wear [min]', 'Type_L', 'Type_M'
+]
+SENSOR_FIELDS = REQUIRED_FIELDS[1:6]
+TYPE_FIELDS = ['Type_L', 'Type_M']
+
+HTTP_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found',
+                405: 'Method Not Allowed', 500: 'Internal Server Error'}
+
+
+class LatencyTracker:
+    """
+    Rolling window of request latencies
+
+    Parameters:
+    -----------
+    window : int
+        Number of most recent requests kept
+    """
+
+    def __init__(self, window=10000):
+        self._latencies = deque(maxlen=window)
+        self.requests = 0
+        self.records = 0
+
+    def record(self, seconds, n_records):
+        self._latencies.append(seconds)
+        self.requests += 1
+        self.records += n_records
+
+    def summary(self):
+        """
+        Latency percentiles in milliseconds
+
+        Returns:
+        --------
+        dict: Request/record counters and p50/p90/p99/max latency
+        """
+        summary = {'requests': self.requests, 'records': self.records}
+        if self._latencies:
+            latencies = np.array(self._latencies) * 1000
+            p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+            summary.update({
+                'p50_ms': round(float(p50), 3),
+                'p90_ms': round(float(p90), 3),
+                'p99_ms': round(float(p99), 3),
+                'max_ms': round(float(latencies.max()), 3)
+            })
+        return summary
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent scoring requests into one predict_batch call
+
+    The first queued request opens a batch; further requests join it
+    until max_batch_size records are collected or max_wait_ms passes.
+
+    Parameters:
+    -----------
+    max_batch_size : int
+        Maximum records scored in one call
+    max_wait_ms : float
+        Longest time a request waits for others to join its batch
+    """
+
+    def __init__(self, max_batch_size=512, max_wait_ms=5.0):
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.batches = 0
+        self.batched_records = 0
+        self._queue = asyncio.Queue()
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def submit(self, records):
+        """
+        Score a list of equipment records
+
+        Returns:
+        --------
+        list of dict: One prediction per record, in order
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((records, future))
+        return await future
+
+    async def _collect(self):
+        batch = [await self._queue.get()]
+        size = len(batch[0][0])
+        deadline = time.monotonic() + self.max_wait
+
+        while size < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            batch.append(item)
+            size += len(item[0])
+
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            records = [record for request_records, _ in batch for record in request_records]
+
+            try:
+                # Scoring runs off the event loop so new requests keep queueing
+                results = await loop.run_in_executor(None, _score_records, records)
+            except Exception:
+                # One bad request must not fail the others: score each on its own
+                for request_records, future in batch:
+                    try:
+                        result = await loop.run_in_executor(None, _score_records, request_records)
+                    except Exception as error:
+                        if not future.done():
+                            future.set_exception(error)
+                    else:
+                        if not future.done():
+                            future.set_result(result)
+                continue
+
+            self.batches += 1
+            self.batched_records += len(records)
+
+            start = 0
+            for request_records, future in batch:
+                end = start + len(request_records)
+                if not future.done():
+                    future.set_result(results[start:end])
+                start = end
+
+
+def _score_records(records):
+    results = predict_batch(pd.DataFrame(records, columns=REQUIRED_FIELDS))
+    return results.to_dict(orient='records')
+
+
+def _validate_records(payload):
+    """
+    Normalize a JSON payload to a list of equipment records
+
+    Returns:
+    --------
+    (list of dict, bool): Records and whether a single object was sent
+    """
+    single = isinstance(payload, dict)
+    records = [payload] if single else payload
+    if not isinstance(records, list) or not records:
+        raise ValueError("Expected an equipment object or a non-empty list of them")
+
+    for i, record in enumerate(records):
+        if not isinstance(record, dict):
+            raise ValueError(f"Record {i} is not an object")
+        missing = [field for field in REQUIRED_FIELDS if field not in record]
+        if missing:
+            raise ValueError(f"Record {i} is missing fields: {missing}")
+        for field in SENSOR_FIELDS:
+            value = record[field]
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not np.isfinite(value):
+                raise ValueError(f"Record {i} field {field!r} must be a finite number, got {value!r}")
+        for field in TYPE_FIELDS:
+            value = record[field]
+            if isinstance(value, bool) or value not in (0, 1):
+                raise ValueError(f"Record {i} field {field!r} must be 0 or 1, got {value!r}")
+
+    return records, single
+
+
+class ScoringServer:
+    """
+    Minimal asyncio HTTP/1.1 service around the prediction module
+
+    Endpoints:
+    ----------
+    POST /predict : one equipment object or a list of them
+    GET /metrics  : latency percentiles and batching counters
+    GET /drift    : per-feature PSI/KS against the training data (with drift=True)
+    GET /health   : liveness check
+
+    Parameters:
+    -----------
+    host : str
+        Interface to bind (localhost by default; no external access)
+    port : int
+        TCP port
+    max_batch_size, max_wait_ms :
+        Micro-batching limits (see MicroBatcher)
+    drift : bool
+        Monitor input drift (needs models/drift_reference.npz)
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, max_batch_size=512, max_wait_ms=5.0,
+                 drift=False):
+        self.host = host
+        self.port = port
+        if drift:
+            enable_drift_monitor()
+        self.batcher = MicroBatcher(max_batch_size, max_wait_ms)
+        self.latency = LatencyTracker()
+        self._server = None
+
+    async def start(self):
+        self.batcher.start()
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        await self.batcher.stop()
+
+    async def serve_forever(self):
+        await self.start()
+        print(f"🔮 Scoring server listening on http://{self.host}:{self.port}")
+        async with self._server:
+            await self._server.serve_forever()
+
+    def metrics(self):
+        metrics = self.latency.summary()
+        metrics['batches'] = self.batcher.batches
+        metrics['avg_batch_size'] = (
+            self.batcher.batched_records / self.batcher.batches if self.batcher.batches else 0.0
+        )
+        return metrics
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, version = request_line.decode('latin-1').split(' ', 2)
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+                status, payload = await self._dispatch(method, path.split('?')[0], body)
+
+                keep_alive = (headers.get('connection', '').lower() != 'close'
+                              and version.strip() == 'HTTP/1.1')
+                self._write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ValueError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method, path, body):
+        if path == '/health':
+            return 200, {'status': 'ok'}
+        if path == '/metrics':
+            return 200, self.metrics()
+        if path == '/drift':
+            monitor = get_drift_monitor()
+            if monitor is None:
+                return 404, {'error': "Drift monitoring is disabled (start with --drift)"}
+            return 200, {'rows': monitor.n_rows, 'features': monitor.scores().to_dict(orient='records')}
+        if path != '/predict':
+            return 404, {'error': f"Unknown path: {path}"}
+        if method != 'POST':
+            return 405, {'error': "Use POST /predict"}
+
+        start = time.perf_counter()
+        try:
+            records, single = _validate_records(json.loads(body))
+        except ValueError as error:
+            return 400, {'error': str(error)}
+
+        try:
+            results = await self.batcher.submit(records)
+        except Exception as error:
+            return 500, {'error': str(error)}
+
+        self.latency.record(time.perf_counter() - start, len(records))
+        return 200, results[0] if single else results
+
+    @staticmethod
+    def _write_response(writer, status, payload, keep_alive):
+        # Dates are serialized as YYYY-MM-DD
+        body = json.dumps(payload, default=str).encode('utf-8')
+        head = (
+            f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode('latin-1') + body)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local equipment failure scoring server")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--max-batch-size', type=int, default=512)
+    parser.add_argument('--max-wait-ms', type=float, default=5.0)
+    parser.add_argument('--drift', action='store_true', help="Serve GET /drift")
+    args = parser.parse_args(argv)
+
+    server = ScoringServer(args.host, args.port, args.max_batch_size, args.max_wait_ms, args.drift)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
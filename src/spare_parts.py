@@ -4,9 +4,31 @@ Spare Parts Optimization Module
 
 import pandas as pd
 import numpy as np
+import time
 
+SPARE_PARTS_CATEGORIES = ['No', 'Yes - Monitor', 'Yes - Urgent']
+PRIORITY_CATEGORIES = ['Low', 'Medium', 'High']
 
-def calculate_spare_parts_need(predictions_df, threshold=0.7):
+
+# Devices below every band: no part needed
+NO_PART_BAND = ('No', 'Low', 0)
+
+
+def default_bands(threshold=0.7):
+    """
+    Default threshold bands: urgent from `threshold`, monitor from 0.5
+    
+    Returns:
+    --------
+    list: (min_failure_prob, spare_parts_needed, priority, quantity) tuples
+    """
+    return [
+        (threshold, 'Yes - Urgent', 'High', 1),
+        (0.5, 'Yes - Monitor', 'Medium', 1)
+    ]
+
+
+def calculate_spare_parts_need(predictions_df, threshold=0.7, compact=False, bands=None):
     """
     Calculate spare parts requirements based on failure predictions
     
@@ -16,58 +38,234 @@ def calculate_spare_parts_need(predictions_df, threshold=0.7):
         Contains: equipment_id, predicted_failure_prob, days_to_failure
     threshold : float
         Failure probability threshold (default: 0.7 = 70%)
+    compact : bool
+        Categorical need/priority columns, float32 probability, int8 quantity
+    bands : list of tuple (optional)
+        (min_failure_prob, spare_parts_needed, priority, quantity) per band;
+        a device falls in the first band (in list order) it reaches, below
+        all bands it needs no part (default: default_bands(threshold))
     
     Returns:
     --------
     DataFrame: Spare parts requirements table
     """
+    # Bands are checked in the given order, like an if/elif chain
+    bands = list(default_bands(threshold) if bands is None else bands)
+    unknown = [band[2] for band in bands if band[2] not in PRIORITY_CATEGORIES]
+    if unknown:
+        raise ValueError(f"Unknown priority {unknown[0]!r}; expected one of {PRIORITY_CATEGORIES}")
     
-    spare_parts_data = []
+    needs = [band[1] for band in bands] + [NO_PART_BAND[0]]
+    priorities = [band[2] for band in bands] + [NO_PART_BAND[1]]
+    quantities = np.array([band[3] for band in bands] + [NO_PART_BAND[2]], dtype=np.int64)
     
-    for _, row in predictions_df.iterrows():
-        equipment_id = row['equipment_id']
-        failure_prob = row['predicted_failure_prob']
-        days_to_failure = row['days_to_failure']
-        
-        # Determine spare parts need
-        if failure_prob >= threshold:
-            need_spare = "Yes - Urgent"
-            priority = "High"
-            quantity = 1
-        elif failure_prob >= 0.5:
-            need_spare = "Yes - Monitor"
-            priority = "Medium"
-            quantity = 1
-        else:
-            need_spare = "No"
-            priority = "Low"
-            quantity = 0
-            
-        spare_parts_data.append({
-            'equipment_id': equipment_id,
-            'failure_probability': failure_prob,
-            'days_to_failure': days_to_failure,
-            'spare_parts_needed': need_spare,
-            'priority': priority,
-            'quantity_required': quantity
-        })
-    
-    spare_parts_df = pd.DataFrame(spare_parts_data)
-    
-    # Calculate totals
-    total_parts_needed = spare_parts_df['quantity_required'].sum()
-    urgent_parts = len(spare_parts_df[spare_parts_df['priority'] == 'High'])
+    # Band of every device (last index = below all bands)
+    failure_prob = predictions_df['predicted_failure_prob'].to_numpy(np.float64)
+    codes = np.select([failure_prob >= band[0] for band in bands], np.arange(len(bands)), len(bands))
+    
+    days_to_failure = predictions_df['days_to_failure'].to_numpy()
+    if compact and len(codes):
+        # Build the categoricals from the band codes directly
+        need_categories = SPARE_PARTS_CATEGORIES + [n for n in dict.fromkeys(needs) if n not in SPARE_PARTS_CATEGORIES]
+        need_codes = np.array([need_categories.index(n) for n in needs], dtype=np.int8)
+        priority_codes = np.array([PRIORITY_CATEGORIES.index(p) for p in priorities], dtype=np.int8)
+        spare_parts_needed = pd.Categorical.from_codes(need_codes[codes], categories=need_categories)
+        priority = pd.Categorical.from_codes(priority_codes[codes], categories=PRIORITY_CATEGORIES, ordered=True)
+        failure_prob_column = failure_prob.astype(np.float32)
+        days_to_failure = days_to_failure.astype(np.int16)
+        quantity = quantities.astype(np.int8)[codes]
+    else:
+        # Take from the per-band labels (keeps the default string dtype)
+        spare_parts_needed = pd.Series(needs).array.take(codes)
+        priority = pd.Series(priorities).array.take(codes)
+        failure_prob_column = failure_prob
+        quantity = quantities[codes]
+    
+    spare_parts_df = pd.DataFrame({
+        'equipment_id': predictions_df['equipment_id'].array,
+        'failure_probability': failure_prob_column,
+        'days_to_failure': days_to_failure,
+        'spare_parts_needed': spare_parts_needed,
+        'priority': priority,
+        'quantity_required': quantity
+    })
+    
+    # Calculate totals from the per-band counts
+    band_counts = np.bincount(codes, minlength=len(needs))
+    priority_counts = {p: int(band_counts[[i for i, q in enumerate(priorities) if q == p]].sum())
+                       for p in PRIORITY_CATEGORIES}
     
     summary = {
-        'total_parts_needed': int(total_parts_needed),
-        'urgent_parts': urgent_parts,
-        'medium_priority': len(spare_parts_df[spare_parts_df['priority'] == 'Medium']),
-        'low_priority': len(spare_parts_df[spare_parts_df['priority'] == 'Low'])
+        'total_parts_needed': int(band_counts @ quantities),
+        'urgent_parts': priority_counts['High'],
+        'medium_priority': priority_counts['Medium'],
+        'low_priority': priority_counts['Low']
     }
     
     return spare_parts_df, summary
 
 
+def benchmark_spare_parts(n_rows=1_000_000, seed=42):
+    """
+    Time calculate_spare_parts_need on a synthetic prediction table
+    
+    Returns:
+    --------
+    dict: Rows, seconds and rows per second
+    """
+    rng = np.random.default_rng(seed)
+    predictions = pd.DataFrame({
+        'equipment_id': np.char.add('EQ-', np.arange(n_rows).astype(str)).astype(object),
+        'predicted_failure_prob': rng.random(n_rows),
+        'days_to_failure': rng.integers(0, 126, n_rows)
+    })
+    
+    start = time.perf_counter()
+    calculate_spare_parts_need(predictions)
+    elapsed = time.perf_counter() - start
+    return {'rows': n_rows, 'seconds': elapsed, 'rows_per_sec': n_rows / elapsed}
+
+
+def failure_count_distribution(probs):
+    """
+    Exact distribution of the number of failures (Poisson-binomial)
+    
+    Each device fails independently with its own probability. The
+    distribution is the product of the polynomials (1 - p + p*x); it is
+    multiplied pairwise in a balanced tree, with every level done as one
+    batched FFT, so 10^5+ devices take O(n log^2 n) instead of the
+    O(n^2) of a running convolution.
+    
+    Parameters:
+    -----------
+    probs : array-like
+        Failure probability of every device
+        
+    Returns:
+    --------
+    ndarray: P(k failures) for k = 0..n
+    """
+    probs = np.clip(np.asarray(probs, dtype=np.float64).ravel(), 0.0, 1.0)
+    if len(probs) == 0:
+        return np.ones(1)
+    
+    # Leaves: one (1 - p, p) polynomial per device, padded with the identity
+    n_leaves = 1 << int(np.ceil(np.log2(len(probs))))
+    polys = np.zeros((n_leaves, 2))
+    polys[:, 0] = 1.0
+    polys[:len(probs), 0] = 1.0 - probs
+    polys[:len(probs), 1] = probs
+    
+    while len(polys) > 1:
+        length = 2 * polys.shape[1] - 1
+        if length <= 64:
+            # Short polynomials: direct products beat the FFT
+            left, right = polys[0::2], polys[1::2]
+            product = np.zeros((len(left), length))
+            for j in range(right.shape[1]):
+                product[:, j:j + left.shape[1]] += left * right[:, j:j + 1]
+        else:
+            size = 1 << int(np.ceil(np.log2(length)))
+            spectrum = np.fft.rfft(polys, n=size, axis=1)
+            product = np.fft.irfft(spectrum[0::2] * spectrum[1::2], n=size, axis=1)[:, :length]
+        # Degree grows by one per leaf; identity padding keeps the top terms zero
+        polys = np.maximum(product, 0.0)
+    
+    pmf = polys[0, :len(probs) + 1]
+    return pmf / pmf.sum()
+
+
+def stock_for_service_level(pmf, service_level):
+    """
+    Smallest stock covering the failure count with the given probability
+    
+    Returns:
+    --------
+    int: k with P(failures <= k) >= service_level
+    """
+    cdf = np.cumsum(pmf)
+    return int(min(np.searchsorted(cdf, service_level - 1e-12), len(pmf) - 1))
+
+
+def forecast_spare_parts_demand(predictions_df, service_levels=(0.95, 0.99), class_column=None,
+                                threshold=0.7, bands=None):
+    """
+    Spare parts stock per part class from the failure count distribution
+    
+    Instead of one part per device over a threshold, the stock covers the
+    number of failures at each service level, using every device's
+    predicted_failure_prob. Devices are assumed to fail independently and
+    to use one part per failure.
+    
+    Parameters:
+    -----------
+    predictions_df : DataFrame
+        Contains: equipment_id, predicted_failure_prob, days_to_failure
+    service_levels : tuple of float
+        Probabilities that the stock covers all failures (e.g. 0.95, 0.99)
+    class_column : str (optional)
+        Column that defines the part classes (e.g. 'Type'); by default the
+        spare_parts_needed bands of calculate_spare_parts_need
+    threshold, bands :
+        Passed to calculate_spare_parts_need for the default classes
+        
+    Returns:
+    --------
+    DataFrame: part_class, devices, expected_failures, failures_std,
+        threshold_quantity and one stock_<level> column per service level,
+        plus an 'All' row pooling every device
+    """
+    spare_parts_df, _ = calculate_spare_parts_need(predictions_df, threshold=threshold, bands=bands)
+    probs = spare_parts_df['failure_probability'].to_numpy(np.float64)
+    quantity = spare_parts_df['quantity_required'].to_numpy()
+    classes = (predictions_df[class_column] if class_column is not None
+               else spare_parts_df['spare_parts_needed']).astype(str).to_numpy()
+    
+    groups = [(name, classes == name) for name in pd.unique(classes)]
+    groups.append(('All', np.ones(len(probs), dtype=bool)))
+    
+    rows = []
+    for name, mask in groups:
+        p = probs[mask]
+        pmf = failure_count_distribution(p)
+        row = {
+            'part_class': name,
+            'devices': int(mask.sum()),
+            'expected_failures': float(p.sum()),
+            'failures_std': float(np.sqrt(np.sum(p * (1 - p)))),
+            'threshold_quantity': int(quantity[mask].sum())
+        }
+        for level in service_levels:
+            row[f'stock_{level * 100:g}'] = stock_for_service_level(pmf, level)
+        rows.append(row)
+    
+    return pd.DataFrame(rows)
+
+
+def benchmark_failure_distribution(n_devices=100_000, seed=42):
+    """
+    Time the failure count distribution and check it against its moments
+    
+    Returns:
+    --------
+    dict: Devices, seconds and the mean / variance errors
+    """
+    probs = np.random.default_rng(seed).beta(0.5, 4.0, n_devices)
+    start = time.perf_counter()
+    pmf = failure_count_distribution(probs)
+    elapsed = time.perf_counter() - start
+    
+    k = np.arange(len(pmf))
+    mean = pmf @ k
+    variance = pmf @ (k - mean) ** 2
+    return {
+        'devices': n_devices,
+        'seconds': elapsed,
+        'mean_error': float(abs(mean - probs.sum())),
+        'variance_error': float(abs(variance - np.sum(probs * (1 - probs))))
+    }
+
+
 def generate_spare_parts_report(spare_parts_df, summary):
     """
     Generate text report for spare parts
@@ -117,3 +315,17 @@ if __name__ == "__main__":
         
     except FileNotFoundError:
         print("Error: model_output.csv not found")
+    
+    print(f"\nBenchmark: {benchmark_spare_parts()}")
+    
+    # Stock from the failure count distribution of a synthetic fleet
+    rng = np.random.default_rng(0)
+    n_devices = 100_000
+    fleet = pd.DataFrame({
+        'equipment_id': np.char.add('EQ-', np.arange(n_devices).astype(str)).astype(object),
+        'predicted_failure_prob': rng.beta(0.5, 4.0, n_devices),
+        'days_to_failure': rng.integers(0, 126, n_devices)
+    })
+    print("\nDemand forecast (95% / 99% service levels):")
+    print(forecast_spare_parts_demand(fleet).to_string(index=False))
+    print(f"\nFailure distribution benchmark: {benchmark_failure_distribution()}")
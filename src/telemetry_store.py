@@ -0,0 +1,322 @@
+"""
+Telemetry Store Module
+"""
+
+import numpy as np
+import threading
+import time
+import os
+
+from src.feature_pipeline import SENSOR_COLUMNS
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SNAPSHOT_PATH = os.path.join(PROJECT_ROOT, 'outputs', 'telemetry_snapshot.npz')
+
+
+class TelemetryStore:
+    """
+    Last N sensor readings per device in preallocated NumPy ring buffers
+
+    Every column is a (capacity, window) array; a device owns one row
+    (its slot) and writes wrap around at the window length. Appending a
+    reading writes a few scalars in place - nothing is allocated per
+    reading. Capacity doubles when more devices than slots arrive.
+
+    Parameters:
+    -----------
+    window : int
+        Readings kept per device
+    capacity : int
+        Initial number of device slots
+    columns : list of str
+        Sensor columns to store
+    dtype : numpy dtype
+        Storage dtype of the sensor columns
+    """
+
+    def __init__(self, window=64, capacity=1024, columns=None, dtype=np.float32):
+        self.window = int(window)
+        self.columns = list(columns if columns is not None else SENSOR_COLUMNS)
+        self.dtype = np.dtype(dtype)
+        self._slots = {}
+        self._ids = []
+        self._lock = threading.Lock()
+        self._allocate(int(capacity))
+
+    def _allocate(self, capacity):
+        self.capacity = capacity
+        self._buffers = {
+            column: np.full((capacity, self.window), np.nan, dtype=self.dtype)
+            for column in self.columns
+        }
+        self._timestamps = np.full((capacity, self.window), np.nan)
+        self._head = np.zeros(capacity, dtype=np.int64)   # next write position
+        self._count = np.zeros(capacity, dtype=np.int64)  # readings held (<= window)
+
+    def _grow(self, min_capacity):
+        capacity = self.capacity
+        while capacity < min_capacity:
+            capacity *= 2
+
+        old = (self._buffers, self._timestamps, self._head, self._count, self.capacity)
+        self._allocate(capacity)
+        buffers, timestamps, head, count, n = old
+        for column in self.columns:
+            self._buffers[column][:n] = buffers[column]
+        self._timestamps[:n] = timestamps
+        self._head[:n] = head
+        self._count[:n] = count
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, equipment_id):
+        return equipment_id in self._slots
+
+    @property
+    def equipment_ids(self):
+        return list(self._ids)
+
+    def slot(self, equipment_id):
+        """
+        Slot of a device, assigning a new one on first sight
+        """
+        slot = self._slots.get(equipment_id)
+        if slot is None:
+            slot = len(self._ids)
+            if slot >= self.capacity:
+                self._grow(slot + 1)
+            self._slots[equipment_id] = slot
+            self._ids.append(equipment_id)
+        return slot
+
+    def append(self, equipment_id, reading, timestamp=None):
+        """
+        Store one reading (O(1))
+
+        Parameters:
+        -----------
+        equipment_id : str
+            Device identifier
+        reading : dict
+            Sensor values keyed by column name
+        timestamp : float (optional)
+            Epoch seconds (default: now)
+        """
+        with self._lock:
+            slot = self.slot(equipment_id)
+            position = self._head[slot]
+            for column, buffer in self._buffers.items():
+                buffer[slot, position] = reading[column]
+            self._timestamps[slot, position] = time.time() if timestamp is None else timestamp
+            self._head[slot] = (position + 1) % self.window
+            if self._count[slot] < self.window:
+                self._count[slot] += 1
+
+    def append_batch(self, equipment_ids, readings, timestamps=None):
+        """
+        Store many readings at once (vectorized)
+
+        Readings of the same device within the batch are stored in order.
+
+        Parameters:
+        -----------
+        equipment_ids : array-like
+            Device identifier per reading
+        readings : DataFrame or dict of array-like
+            Sensor columns
+        timestamps : array-like (optional)
+            Epoch seconds per reading (default: now)
+        """
+        n = len(equipment_ids)
+        if n == 0:
+            return
+
+        with self._lock:
+            slots = np.fromiter((self.slot(e) for e in equipment_ids), dtype=np.int64, count=n)
+
+            # Rank of each reading among the batch's readings of the same device
+            order = np.argsort(slots, kind='stable')
+            sorted_slots = slots[order]
+            group_start = np.r_[0, np.flatnonzero(np.diff(sorted_slots)) + 1]
+            group_sizes = np.diff(np.r_[group_start, n])
+            rank = np.empty(n, dtype=np.int64)
+            rank[order] = np.arange(n) - np.repeat(group_start, group_sizes)
+
+            positions = (self._head[slots] + rank) % self.window
+            for column, buffer in self._buffers.items():
+                buffer[slots, positions] = np.asarray(readings[column], dtype=self.dtype)
+            if timestamps is None:
+                timestamps = np.full(n, time.time())
+            self._timestamps[slots, positions] = timestamps
+
+            unique_slots = sorted_slots[group_start]
+            self._head[unique_slots] = (self._head[unique_slots] + group_sizes) % self.window
+            self._count[unique_slots] = np.minimum(self._count[unique_slots] + group_sizes, self.window)
+
+    def latest(self, columns=None):
+        """
+        Latest reading of every device (vectorized)
+
+        Returns:
+        --------
+        dict: equipment_id, timestamp and one array per column (device order)
+        """
+        n = len(self._ids)
+        rows = np.arange(n)
+        last = (self._head[:n] - 1) % self.window
+
+        result = {
+            'equipment_id': np.array(self._ids, dtype=object),
+            'timestamp': self._timestamps[rows, last]
+        }
+        for column in (columns or self.columns):
+            result[column] = self._buffers[column][rows, last]
+        return result
+
+    def window_for(self, equipment_id, columns=None):
+        """
+        Stored readings of one device, oldest first
+
+        Returns:
+        --------
+        dict: timestamp and one array per column
+        """
+        slot = self._slots[equipment_id]
+        count = self._count[slot]
+        positions = (self._head[slot] - count + np.arange(count)) % self.window
+
+        result = {'timestamp': self._timestamps[slot, positions]}
+        for column in (columns or self.columns):
+            result[column] = self._buffers[column][slot, positions]
+        return result
+
+    def next_evicted(self, equipment_id):
+        """
+        Reading the next append will overwrite
+
+        Returns:
+        --------
+        dict or None: timestamp and column values, None while the window is not full
+        """
+        slot = self._slots.get(equipment_id)
+        if slot is None or self._count[slot] < self.window:
+            return None
+
+        position = self._head[slot]
+        evicted = {'timestamp': self._timestamps[slot, position]}
+        for column, buffer in self._buffers.items():
+            evicted[column] = buffer[slot, position]
+        return evicted
+
+    def snapshot(self, path=SNAPSHOT_PATH):
+        """
+        Save all buffers to a .npz file
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        n = len(self._ids)
+        with self._lock:
+            arrays = {f'column_{i}': self._buffers[column][:n] for i, column in enumerate(self.columns)}
+            np.savez(
+                path,
+                equipment_ids=np.array(self._ids, dtype=str),
+                columns=np.array(self.columns, dtype=str),
+                timestamps=self._timestamps[:n],
+                head=self._head[:n],
+                count=self._count[:n],
+                window=self.window,
+                **arrays
+            )
+
+    @classmethod
+    def restore(cls, path=SNAPSHOT_PATH):
+        """
+        Rebuild a store saved with snapshot()
+        """
+        with np.load(path, allow_pickle=False) as arrays:
+            columns = arrays['columns'].tolist()
+            equipment_ids = arrays['equipment_ids'].tolist()
+            n = len(equipment_ids)
+            store = cls(
+                window=int(arrays['window']), capacity=max(n, 1), columns=columns,
+                dtype=arrays['column_0'].dtype if columns else np.float32
+            )
+            for i, column in enumerate(columns):
+                store._buffers[column][:n] = arrays[f'column_{i}']
+            store._timestamps[:n] = arrays['timestamps']
+            store._head[:n] = arrays['head']
+            store._count[:n] = arrays['count']
+        store._ids = equipment_ids
+        store._slots = {equipment_id: slot for slot, equipment_id in enumerate(equipment_ids)}
+        return store
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_telemetry_store():
+    """
+    Process-wide telemetry store (created on first call)
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = TelemetryStore()
+    return _store
+
+
+def benchmark_ingest(n_devices=100_000, readings_per_device=10, batch_size=10_000, window=64):
+    """
+    Measure ingest and query throughput
+
+    Returns:
+    --------
+    dict: Readings/sec for batched and single appends, latest() time
+    """
+    rng = np.random.default_rng(42)
+    store = TelemetryStore(window=window, capacity=n_devices)
+    ids = np.array([f'EQ-{i:06d}' for i in range(n_devices)], dtype=object)
+
+    total = n_devices * readings_per_device
+    start = time.perf_counter()
+    for offset in range(0, total, batch_size):
+        batch_ids = ids[np.arange(offset, min(offset + batch_size, total)) % n_devices]
+        readings = {column: rng.normal(size=len(batch_ids)) for column in store.columns}
+        store.append_batch(batch_ids, readings)
+    batch_seconds = time.perf_counter() - start
+
+    reading = {column: 1.0 for column in store.columns}
+    n_single = min(total, 100_000)
+    start = time.perf_counter()
+    for i in range(n_single):
+        store.append(ids[i % n_devices], reading)
+    single_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    store.latest()
+    latest_seconds = time.perf_counter() - start
+
+    return {
+        'devices': n_devices,
+        'batch_readings_per_sec': total / batch_seconds,
+        'single_readings_per_sec': n_single / single_seconds,
+        'latest_all_devices_ms': latest_seconds * 1000
+    }
+
+
+if __name__ == "__main__":
+    # Example usage
+    store = TelemetryStore(window=4)
+    for wear in [100, 110, 120, 130, 140]:
+        store.append('EQ-01', {
+            'Air temperature [K]': 300, 'Process temperature [K]': 310,
+            'Rotational speed [rpm]': 1500, 'Torque [Nm]': 40, 'Tool wear [min]': wear
+        })
+    print(f"EQ-01 tool wear window: {store.window_for('EQ-01')['Tool wear [min]']}")
+
+    print("\nIngest benchmark:")
+    for key, value in benchmark_ingest().items():
+        print(f"  {key}: {value:,.1f}")
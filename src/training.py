@@ -0,0 +1,353 @@
+"""
+Model Training Module
+"""
+
+import argparse
+import json
+import os
+import shutil
+import time
+from datetime import datetime
+
+import joblib
+import numpy as np
+from joblib import Memory, Parallel, delayed
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import f1_score, precision_score, recall_score, roc_auc_score
+from sklearn.model_selection import ParameterGrid, StratifiedKFold, train_test_split
+
+from src.data_preprocessing import load_data
+from src.feature_pipeline import FeaturePipeline
+from src.forest_engine import export_forest
+from src.drift_monitor import DriftReference
+from src.model_manager import (MODEL_PATH, SCALER_PATH, FOREST_PATH, PIPELINE_PATH,
+                               SCREEN_MODEL_PATH, DRIFT_REFERENCE_PATH)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DATA_PATH = os.path.join(PROJECT_ROOT, 'data', 'ai4i2020.csv')
+VERSIONS_DIR = os.path.join(PROJECT_ROOT, 'models', 'versions')
+CACHE_DIR = os.path.join(PROJECT_ROOT, '.cache', 'training')
+
+TARGET_COLUMN = 'Machine failure'
+RANDOM_STATE = 42
+
+# Search spaces; the notebook's production settings are included
+PARAM_GRIDS = {
+    'random_forest': {
+        'n_estimators': [200],
+        'max_depth': [10, 15, None],
+        'min_samples_split': [5],
+        'min_samples_leaf': [1, 2]
+    },
+    'logistic_regression': {
+        'C': [0.1, 1.0, 10.0]
+    },
+    'xgboost': {
+        'n_estimators': [200],
+        'max_depth': [4, 6],
+        'learning_rate': [0.1]
+    }
+}
+
+
+def _build_model(name, params, random_state=RANDOM_STATE):
+    """
+    Untrained estimator for a model family and parameter set
+    """
+    if name == 'random_forest':
+        return RandomForestClassifier(
+            class_weight='balanced', random_state=random_state, n_jobs=1, **params
+        )
+    if name == 'logistic_regression':
+        return LogisticRegression(
+            class_weight='balanced', max_iter=1000, random_state=random_state, **params
+        )
+    if name == 'xgboost':
+        from xgboost import XGBClassifier
+
+        return XGBClassifier(
+            subsample=0.8, colsample_bytree=0.8, eval_metric='logloss',
+            random_state=random_state, n_jobs=1, **params
+        )
+    raise ValueError(f"Unknown model: {name}")
+
+
+def _resample(X, y, smote, random_state=RANDOM_STATE):
+    """
+    Balance the classes with SMOTE when requested and available
+    """
+    if not smote:
+        return X, y
+    from imblearn.over_sampling import SMOTE
+
+    return SMOTE(random_state=random_state, k_neighbors=5).fit_resample(X, y)
+
+
+def _data_signature(data_path):
+    stat = os.stat(data_path)
+    return {'path': os.path.abspath(data_path), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def _split(data_path, test_size, random_state):
+    df = load_data(data_path)
+    y = df[TARGET_COLUMN].to_numpy()
+    train_df, test_df, y_train, y_test = train_test_split(
+        df, y, test_size=test_size, random_state=random_state, stratify=y
+    )
+    return train_df, test_df, y_train, y_test
+
+
+def _fold_matrices(data_path, data_signature, test_size, n_splits, fold, smote, random_state):
+    """
+    Engineered, scaled (and resampled) matrices for one CV fold
+
+    Cached on disk by joblib.Memory; data_signature (size + mtime of the
+    CSV) is part of the key, so the cache is rebuilt when the data changes.
+    The scaler is fit on the fold's training part only.
+    """
+    train_df, _, y_train, _ = _split(data_path, test_size, random_state)
+    folds = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+    train_idx, valid_idx = list(folds.split(train_df, y_train))[fold]
+
+    pipeline = FeaturePipeline().fit(train_df.iloc[train_idx])
+    X_train = pipeline.transform(train_df.iloc[train_idx])
+    X_valid = pipeline.transform(train_df.iloc[valid_idx])
+    X_train, y_fold = _resample(X_train, y_train[train_idx], smote, random_state)
+
+    return X_train, y_fold, X_valid, y_train[valid_idx]
+
+
+def _classification_metrics(y_true, y_pred, y_prob):
+    return {
+        'precision': float(precision_score(y_true, y_pred, pos_label=1, zero_division=0)),
+        'recall': float(recall_score(y_true, y_pred, pos_label=1, zero_division=0)),
+        'f1': float(f1_score(y_true, y_pred, pos_label=1, zero_division=0)),
+        'roc_auc': float(roc_auc_score(y_true, y_prob))
+    }
+
+
+def _evaluate_candidate(fold_matrices, name, params, fold, random_state):
+    X_train, y_train, X_valid, y_valid = fold_matrices(fold)
+    model = _build_model(name, params, random_state).fit(X_train, y_train)
+    y_prob = model.predict_proba(X_valid)[:, 1]
+    return name, params, fold, _classification_metrics(y_valid, (y_prob >= 0.5).astype(int), y_prob)
+
+
+def cross_validate_models(data_path=DATA_PATH, model_names=('random_forest',), param_grids=None,
+                          n_splits=5, test_size=0.2, smote=True, n_jobs=-1,
+                          cache_dir=CACHE_DIR, random_state=RANDOM_STATE):
+    """
+    Stratified k-fold hyperparameter search, parallel across cores
+
+    Every (model, parameter set, fold) combination is one job. Fold
+    matrices are cached on disk, so repeated searches skip preprocessing.
+
+    Returns:
+    --------
+    dict: Per model, a list of {params, mean/std metrics} sorted by mean F1
+    """
+    param_grids = {**PARAM_GRIDS, **(param_grids or {})}
+    memory = Memory(cache_dir, verbose=0)
+    cached_fold = memory.cache(_fold_matrices)
+    signature = _data_signature(data_path)
+
+    def fold_matrices(fold):
+        return cached_fold(data_path, signature, test_size, n_splits, fold, smote, random_state)
+
+    # Build (or verify) the fold cache once before fanning out
+    for fold in range(n_splits):
+        fold_matrices(fold)
+
+    jobs = [
+        delayed(_evaluate_candidate)(fold_matrices, name, params, fold, random_state)
+        for name in model_names
+        for params in ParameterGrid(param_grids[name])
+        for fold in range(n_splits)
+    ]
+    results = Parallel(n_jobs=n_jobs)(jobs)
+
+    grouped = {}
+    for name, params, fold, metrics in results:
+        key = (name, json.dumps(params, sort_keys=True))
+        grouped.setdefault(key, []).append(metrics)
+
+    search = {name: [] for name in model_names}
+    for (name, params_key), fold_metrics in grouped.items():
+        summary = {'params': json.loads(params_key)}
+        for metric in fold_metrics[0]:
+            values = np.array([m[metric] for m in fold_metrics])
+            summary[f'mean_{metric}'] = float(values.mean())
+            summary[f'std_{metric}'] = float(values.std())
+        search[name].append(summary)
+
+    for name in search:
+        search[name].sort(key=lambda r: r['mean_f1'], reverse=True)
+
+    return search
+
+
+def train_models(data_path=DATA_PATH, model_names=('random_forest', 'logistic_regression'),
+                 n_splits=5, test_size=0.2, smote=True, n_jobs=-1, output_dir=VERSIONS_DIR,
+                 cache_dir=CACHE_DIR, promote=True, random_state=RANDOM_STATE):
+    """
+    Rebuild the model and scaler from the training CSV
+
+    Runs the CV search, refits the best parameters of each model family on
+    the full training split, evaluates them on the held-out test split and
+    writes a versioned artifact directory. The first model family is the
+    production model (machine_failure_model.pkl).
+
+    Parameters:
+    -----------
+    data_path : str
+        Training CSV (ai4i2020.csv schema)
+    model_names : sequence of str
+        Model families to search (random_forest, logistic_regression, xgboost)
+    n_splits : int
+        Stratified CV folds
+    test_size : float
+        Held-out test fraction
+    smote : bool
+        Oversample the failure class with SMOTE (needs imbalanced-learn)
+    n_jobs : int
+        Parallel jobs for the search (-1 = all cores)
+    output_dir : str
+        Parent directory of the versioned artifact directories
+    cache_dir : str
+        joblib cache for fold matrices
+    promote : bool
+        Also copy the artifacts to models/ so the predictor uses them
+
+    Returns:
+    --------
+    dict: Training report (also saved as metrics.json)
+    """
+    start = time.perf_counter()
+
+    if smote:
+        try:
+            import imblearn  # noqa: F401
+        except ImportError:
+            print("⚠️  imbalanced-learn not installed; training without SMOTE")
+            smote = False
+
+    search = cross_validate_models(
+        data_path, model_names, n_splits=n_splits, test_size=test_size, smote=smote,
+        n_jobs=n_jobs, cache_dir=cache_dir, random_state=random_state
+    )
+    search_seconds = time.perf_counter() - start
+
+    train_df, test_df, y_train, y_test = _split(data_path, test_size, random_state)
+    pipeline = FeaturePipeline().fit(train_df)
+    X_train, y_balanced = _resample(pipeline.transform(train_df), y_train, smote, random_state)
+    X_test = pipeline.transform(test_df)
+
+    version = datetime.now().strftime('%Y%m%d-%H%M%S')
+    version_dir = os.path.join(output_dir, version)
+    os.makedirs(version_dir, exist_ok=True)
+
+    report = {
+        'version': version,
+        'data': _data_signature(data_path),
+        'n_splits': n_splits,
+        'test_size': test_size,
+        'smote': smote,
+        'random_state': random_state,
+        'cv_search_seconds': search_seconds,
+        'models': {}
+    }
+
+    fitted = {}
+    for name in model_names:
+        best_params = search[name][0]['params']
+        fit_start = time.perf_counter()
+        model = _build_model(name, best_params, random_state)
+        if hasattr(model, 'n_jobs'):
+            model.set_params(n_jobs=n_jobs)
+        model.fit(X_train, y_balanced)
+        fit_seconds = time.perf_counter() - fit_start
+
+        y_prob = model.predict_proba(X_test)[:, 1]
+        report['models'][name] = {
+            'best_params': best_params,
+            'cv': search[name],
+            'test': _classification_metrics(y_test, model.predict(X_test), y_prob),
+            'fit_seconds': fit_seconds
+        }
+        fitted[name] = model
+        joblib.dump(model, os.path.join(version_dir, f'{name}.pkl'))
+
+    production_name = model_names[0]
+    report['production_model'] = production_name
+
+    joblib.dump(fitted[production_name], os.path.join(version_dir, os.path.basename(MODEL_PATH)))
+    joblib.dump(pipeline.scaler, os.path.join(version_dir, os.path.basename(SCALER_PATH)))
+    pipeline.save(os.path.join(version_dir, os.path.basename(PIPELINE_PATH)))
+    # Training distribution (before resampling) for the drift monitor
+    DriftReference.from_matrix(pipeline.transform(train_df), pipeline.feature_columns).save(
+        os.path.join(version_dir, os.path.basename(DRIFT_REFERENCE_PATH)))
+    if production_name == 'random_forest':
+        export_forest(fitted[production_name], os.path.join(version_dir, os.path.basename(FOREST_PATH)))
+    if 'logistic_regression' in fitted and production_name != 'logistic_regression':
+        # First tier of cascade prediction
+        joblib.dump(fitted['logistic_regression'],
+                    os.path.join(version_dir, os.path.basename(SCREEN_MODEL_PATH)))
+
+    report['training_seconds'] = time.perf_counter() - start
+    with open(os.path.join(version_dir, 'metrics.json'), 'w') as f:
+        json.dump(report, f, indent=2)
+
+    if promote:
+        models_dir = os.path.dirname(MODEL_PATH)
+        for path in (MODEL_PATH, SCALER_PATH, PIPELINE_PATH, FOREST_PATH, SCREEN_MODEL_PATH,
+                     DRIFT_REFERENCE_PATH):
+            source = os.path.join(version_dir, os.path.basename(path))
+            if os.path.exists(source):
+                shutil.copy2(source, os.path.join(models_dir, os.path.basename(path)))
+            elif os.path.exists(path):
+                # e.g. a stale forest export from a previous model
+                os.remove(path)
+
+    report['version_dir'] = version_dir
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the equipment failure model")
+    parser.add_argument('--data', default=DATA_PATH, help="Training CSV")
+    parser.add_argument('--models', nargs='+', default=['random_forest', 'logistic_regression'],
+                        choices=sorted(PARAM_GRIDS), help="Model families; the first is deployed")
+    parser.add_argument('--folds', type=int, default=5, help="Stratified CV folds")
+    parser.add_argument('--test-size', type=float, default=0.2)
+    parser.add_argument('--n-jobs', type=int, default=-1, help="Parallel jobs (-1 = all cores)")
+    parser.add_argument('--no-smote', action='store_true', help="Skip SMOTE oversampling")
+    parser.add_argument('--no-promote', action='store_true',
+                        help="Only write the versioned directory, keep models/ unchanged")
+    parser.add_argument('--output-dir', default=VERSIONS_DIR)
+    parser.add_argument('--cache-dir', default=CACHE_DIR)
+    parser.add_argument('--seed', type=int, default=RANDOM_STATE)
+    args = parser.parse_args(argv)
+
+    report = train_models(
+        args.data, tuple(args.models), n_splits=args.folds, test_size=args.test_size,
+        smote=not args.no_smote, n_jobs=args.n_jobs, output_dir=args.output_dir,
+        cache_dir=args.cache_dir, promote=not args.no_promote, random_state=args.seed
+    )
+
+    print("=" * 70)
+    print(f"📊 TRAINING REPORT ({report['version']})")
+    print("=" * 70)
+    for name, result in report['models'].items():
+        test = result['test']
+        print(f"{name:<22} CV F1 {result['cv'][0]['mean_f1']:.3f}  "
+              f"Test P {test['precision']:.3f}  R {test['recall']:.3f}  "
+              f"F1 {test['f1']:.3f}  AUC {test['roc_auc']:.3f}")
+        print(f"{'':<22} best params: {result['best_params']}")
+    print(f"\n⏱  Training time: {report['training_seconds']:.1f}s")
+    print(f"📁 Artifacts saved to: {report['version_dir']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Parity tests: CompiledForest vs sklearn predict_proba
+"""
+
+import os
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from src.data_preprocessing import load_data
+from src.feature_pipeline import FeaturePipeline
+from src.forest_engine import CompiledForest, compile_forest, check_parity
+from src.model_manager import MODEL_PATH
+
+
+@pytest.fixture(scope='module')
+def dataset():
+    df = load_data(use_cache=False)
+    X = FeaturePipeline().fit(df).transform(df)
+    return X, df['Machine failure'].to_numpy()
+
+
+@pytest.fixture(scope='module')
+def forest_model(dataset):
+    X, y = dataset
+    return RandomForestClassifier(n_estimators=25, max_depth=12, random_state=42, n_jobs=1).fit(X, y)
+
+
+def test_probabilities_match_sklearn(dataset, forest_model):
+    X, _ = dataset
+    forest = compile_forest(forest_model)
+    np.testing.assert_allclose(forest.predict_proba(X), forest_model.predict_proba(X), rtol=0, atol=1e-12)
+    assert check_parity(forest_model, forest, X)['passed']
+
+
+def test_float32_input_and_single_rows(dataset, forest_model):
+    X, _ = dataset
+    forest = compile_forest(forest_model)
+    X32 = X[:500].astype(np.float32)
+    np.testing.assert_allclose(forest.predict_proba(X32), forest_model.predict_proba(X32), rtol=0, atol=1e-12)
+    for row in X[:20]:
+        np.testing.assert_allclose(forest.predict_proba(row[None, :]),
+                                   forest_model.predict_proba(row[None, :]), rtol=0, atol=1e-12)
+
+
+def test_multiclass_forest(dataset):
+    X, _ = dataset
+    y = np.digitize(X[:, 4], [-0.5, 0.5])  # three tool wear bands
+    model = RandomForestClassifier(n_estimators=10, max_depth=8, random_state=0).fit(X, y)
+    forest = compile_forest(model)
+    np.testing.assert_allclose(forest.predict_proba(X), model.predict_proba(X), rtol=0, atol=1e-12)
+    np.testing.assert_array_equal(forest.predict(X), model.predict(X))
+
+
+def test_save_load_round_trip(tmp_path, dataset, forest_model):
+    X, _ = dataset
+    path = os.path.join(tmp_path, 'model.forest.npz')
+    compile_forest(forest_model).save(path)
+    np.testing.assert_allclose(CompiledForest.load(path).predict_proba(X),
+                               forest_model.predict_proba(X), rtol=0, atol=1e-12)
+
+
+@pytest.mark.skipif(not os.path.exists(MODEL_PATH), reason="models/machine_failure_model.pkl not trained")
+def test_production_model_parity():
+    from src.model_manager import get_model_manager
+
+    models = get_model_manager()
+    if not isinstance(models.model, RandomForestClassifier):
+        pytest.skip("Production model is not a random forest")
+    X = models.pipeline.transform(load_data(use_cache=False))
+    forest = compile_forest(models.model)
+    np.testing.assert_allclose(forest.predict_proba(X), models.model.predict_proba(X), rtol=0, atol=1e-12)
@@ -0,0 +1,76 @@
+"""
+ScheduleState tests: incremental patches keep the schedule consistent
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.maintenance_scheduling import ScheduleState
+
+
+def predictions(probs, days):
+    return pd.DataFrame({
+        'equipment_id': [f'E{i}' for i in range(len(probs))],
+        'predicted_failure_prob': probs,
+        'days_to_failure': days,
+    })
+
+
+def check_invariants(state):
+    capacity = state.capacity
+    load = {}
+    for equipment_id, job in state._jobs.items():
+        day = state.scheduled_day(equipment_id)
+        load[day] = load.get(day, 0) + 1
+        assert (equipment_id in state.late_jobs) == (day > job['deadline'])
+    assert all(count <= capacity for count in load.values())
+
+    # No late job may have a free day on or before its deadline
+    for equipment_id in state.late_jobs:
+        deadline = state._jobs[equipment_id]['deadline']
+        free = [day for day in range(deadline + 1) if load.get(day, 0) < capacity]
+        assert not free, f'{equipment_id} is late but day {free[0]} is free'
+
+
+def test_backfill_respects_deadlines():
+    state = ScheduleState.build(predictions([0.94, 0.92], [0, 0]), max_daily_capacity=1)
+    state.update_prediction('E3', 0.14, 0)
+    state.update_prediction('E2', 0.45, 1)
+    state.remove('E0')
+
+    assert state.scheduled_day('E2') == 1
+    assert 'E2' not in state.late_jobs
+    check_invariants(state)
+
+
+@pytest.mark.parametrize('capacity', [1, 3])
+def test_random_updates_and_removes_keep_invariants(capacity):
+    rng = np.random.default_rng(capacity)
+    n = 60
+    state = ScheduleState.build(predictions(rng.random(n), rng.integers(0, 15, n)),
+                                max_daily_capacity=capacity)
+    check_invariants(state)
+
+    next_id = n
+    for _ in range(400):
+        ids = list(state._jobs)
+        if ids and rng.random() < 0.3:
+            state.remove(ids[rng.integers(len(ids))])
+        else:
+            if ids and rng.random() < 0.7:
+                equipment_id = ids[rng.integers(len(ids))]
+            else:
+                equipment_id, next_id = f'E{next_id}', next_id + 1
+            state.update_prediction(equipment_id, float(rng.random()), int(rng.integers(0, 15)))
+        check_invariants(state)
+
+
+def test_rebuild_after_updates_keeps_invariants():
+    rng = np.random.default_rng(7)
+    state = ScheduleState.build(predictions(rng.random(40), rng.integers(0, 10, 40)), max_daily_capacity=2)
+    for i in range(40):
+        state.update_prediction(f'E{i}', float(rng.random()), int(rng.integers(0, 10)))
+    state.rebuild()
+    check_invariants(state)
+    assert state.top_k_urgent(5)['urgency_score'].is_monotonic_decreasing
@@ -2,11 +2,7 @@
 UI Pages Package
 """
 
-from . import home
-from . import prediction_page
-from . import maintenance_page
-from . import spare_parts_page
-from . import cost_analysis_page
+import importlib
 
 __all__ = [
     'home',
@@ -15,3 +11,12 @@ __all__ = [
     'spare_parts_page',
     'cost_analysis_page'
 ]
+
+
+def __getattr__(name):
+    # Pages are imported on first access so unused pages cost nothing
+    if name in __all__:
+        module = importlib.import_module(f'.{name}', __name__)
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
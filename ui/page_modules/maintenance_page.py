@@ -9,7 +9,7 @@ import os
 import sys
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
-from src.maintenance_scheduling import create_maintenance_schedule, assign_maintenance_dates
+from src.maintenance_scheduling import ScheduleState, generate_maintenance_summary
 
 
 def show():
@@ -22,9 +22,26 @@ def show():
         
         st.markdown("### Current Equipment Status:")
         
-        # Create schedule
-        schedule = create_maintenance_schedule(predictions)
-        schedule = assign_maintenance_dates(schedule)
+        # Create the schedule once a day, then patch it as predictions change
+        state = st.session_state.get('schedule_state')
+        if state is None or state.start_date != pd.Timestamp.today().normalize():
+            state = ScheduleState.build(predictions)
+            st.session_state['schedule_state'] = state
+        else:
+            state.sync(predictions)
+        schedule = state.to_frame()
+        
+        summary = generate_maintenance_summary(schedule, state.calendar)
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Next 7 days", summary['next_7_days'])
+        col2.metric("Next 14 days", summary['next_14_days'])
+        col3.metric("Next 30 days", summary['next_30_days'])
+        
+        st.markdown("### 🔜 Next Jobs:")
+        st.dataframe(
+            state.top_k_urgent(10)[['equipment_id', 'priority', 'urgency_score', 'scheduled_maintenance_date']],
+            use_container_width=True
+        )
         
         # Display table
         st.dataframe(
@@ -39,6 +56,10 @@ def show():
         
         st.success(f"✅ Maintenance schedule saved")
         
+        late_jobs = int(schedule['late'].sum())
+        if late_jobs:
+            st.warning(f"⚠️ {late_jobs} job(s) cannot be done before their predicted failure date")
+        
         # Priority distribution chart
         st.markdown("### 📊 Priority Distribution:")
         
@@ -4,23 +4,22 @@ Prediction Page
 
 import streamlit as st
 import pandas as pd
-import joblib
 import sys
 import os
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
 from src.prediction import predict_equipment_failure
+from src.data_preprocessing import get_equipment_features
+from src.model_manager import get_model_manager
+from src.telemetry_store import get_telemetry_store
 
 
-@st.cache_resource
 def load_models():
+    # Shared with src.prediction, so the artifacts are only unpickled once
     try:
-        model_path = os.path.join('models', 'machine_failure_model.pkl')
-        scaler_path = os.path.join('models', 'scaler.pkl')
-        model = joblib.load(model_path)
-        scaler = joblib.load(scaler_path)
-        return model, scaler
-    except:
+        models = get_model_manager()
+        return models.model, models.scaler
+    except Exception:
         return None, None
 
 
@@ -47,25 +46,21 @@ def show():
         torque = st.number_input("Torque (Nm)", min_value=0.0, max_value=100.0, value=40.0, step=0.1)
         tool_wear = st.number_input("Tool Wear (min)", min_value=0, max_value=250, value=180, step=1)
         equipment_type = st.selectbox("Equipment Type", ["Low (L)", "Medium (M)", "High (H)"])
-        
-        type_l = 1 if equipment_type == "Low (L)" else 0
-        type_m = 1 if equipment_type == "Medium (M)" else 0
     
     st.markdown("---")
     
     if st.button("🔮 Predict", type="primary"):
         equipment_data = {
             'equipment_id': equipment_id,
-            'Air temperature [K]': air_temp,
-            'Process temperature [K]': process_temp,
-            'Rotational speed [rpm]': rotational_speed,
-            'Torque [Nm]': torque,
-            'Tool wear [min]': tool_wear,
-            'Type_L': type_l,
-            'Type_M': type_m
+            **get_equipment_features(
+                equipment_type=equipment_type[-2],  # "Low (L)" -> "L"
+                air_temp=air_temp, process_temp=process_temp, rpm=rotational_speed,
+                torque=torque, tool_wear=tool_wear
+            )
         }
         
         result = predict_equipment_failure(equipment_data)
+        get_telemetry_store().append(equipment_id, equipment_data)
         
         # Save result
         result_df = pd.DataFrame([result])
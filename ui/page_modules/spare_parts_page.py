@@ -8,7 +8,7 @@ import os
 import sys
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
-from src.spare_parts import calculate_spare_parts_need, generate_spare_parts_report
+from src.spare_parts import calculate_spare_parts_need, generate_spare_parts_report, forecast_spare_parts_demand
 
 
 def show():
@@ -44,6 +44,11 @@ def show():
         st.markdown("### 📋 Detailed Requirements:")
         st.dataframe(spare_parts_df, use_container_width=True)
         
+        # Stock levels from the failure count distribution
+        st.markdown("### 📈 Demand Forecast:")
+        st.caption("Parts to stock so every failure is covered with 95% / 99% probability")
+        st.dataframe(forecast_spare_parts_demand(predictions), use_container_width=True)
+        
         # Save report
         report_file = os.path.join('outputs', 'spare_parts_report.csv')
         spare_parts_df.to_csv(report_file, index=False)